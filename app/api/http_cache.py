@@ -0,0 +1,120 @@
+"""Conditional GET support for panel endpoints (ETag / Last-Modified / 304)"""
+import hashlib
+import inspect
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from functools import wraps
+from typing import Optional
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from app.core.cache import cache
+
+# The dashboard page embeds every panel, so keep browser/proxy copies short-lived
+INDEX_MAX_AGE = 10
+
+
+def etag_for(panel: str) -> Optional[str]:
+    """Build a weak ETag from the panel's cache timestamp, or None if not cached."""
+    updated_at = cache.get_updated_at(panel)
+    if updated_at is None:
+        return None
+    return f'W/"{panel}-{int(updated_at * 1_000_000_000)}"'
+
+
+def composite_etag(panels, *extra: str) -> Optional[str]:
+    """Build one weak ETag over several panels' cache timestamps.
+
+    Returns None unless every panel is cached. `extra` covers anything else
+    the response varies on.
+    """
+    parts = []
+    for panel in panels:
+        updated_at = cache.get_updated_at(panel)
+        if updated_at is None:
+            return None
+        parts.append(f"{panel}:{updated_at}")
+    digest = hashlib.blake2b("|".join((*parts, *extra)).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+def not_modified_since(request: Request, updated_at: float) -> bool:
+    """Check the request's If-Modified-Since header against a fetch time."""
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return int(updated_at) <= since
+
+
+def is_fresh(request: Request, panel: str, etag: str) -> bool:
+    """Whether the client's copy is current. If-None-Match wins when both are sent."""
+    if "if-none-match" in request.headers:
+        return etag_matches(request, etag)
+    return not_modified_since(request, cache.get_updated_at(panel) or time.time())
+
+
+def cache_headers(panel: str, etag: str) -> dict:
+    """Validator headers for a cached panel.
+
+    no-cache makes the browser revalidate on every request, so the htmx
+    refetch fired by an SSE update always gets the new data; an unchanged
+    panel still costs only a 304.
+    """
+    updated_at = cache.get_updated_at(panel) or time.time()
+    return {
+        "ETag": etag,
+        "Last-Modified": formatdate(updated_at, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def conditional(panel: str):
+    """Decorator for panel routes: answer 304 when the client's copy is current.
+
+    The wrapped handler only runs (and only renders/serializes) when the
+    panel's cached data has changed since the client last fetched it.
+    """
+    def decorator(handler):
+        params = inspect.signature(handler).parameters
+        wants_request = "request" in params
+
+        @wraps(handler)
+        async def wrapper(request: Request, **kwargs):
+            etag = etag_for(panel)
+            if etag and is_fresh(request, panel, etag):
+                return Response(status_code=304, headers=cache_headers(panel, etag))
+
+            if wants_request:
+                kwargs["request"] = request
+            response = await handler(**kwargs)
+            if not isinstance(response, Response):
+                response = ORJSONResponse(response)
+
+            # Handler may have just refreshed the cache, so rebuild the tag
+            etag = etag_for(panel)
+            if etag:
+                response.headers.update(cache_headers(panel, etag))
+            return response
+
+        # Expose `request` to FastAPI even when the handler doesn't take it
+        wrapper.__signature__ = inspect.Signature([
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            *(p.replace(kind=inspect.Parameter.KEYWORD_ONLY) for name, p in params.items() if name != "request"),
+        ])
+        return wrapper
+
+    return decorator
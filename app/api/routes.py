@@ -1,191 +1,147 @@
+import os
 from typing import Optional
+import jinja2
 from fastapi import APIRouter, Request, Response
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from app.services import weather, news, transit, events, air_quality, markets
 from app.services import parking, trains, bikes
 from app.services import emergency, cameras, flights, ticker, map_data, vision, traffic
-from app.services import flightradar
+from app.services import flightradar, dashboard
+from app.api.http_cache import conditional, composite_etag, etag_matches, INDEX_MAX_AGE
+from app.config import IS_PRODUCTION, JINJA_BYTECODE_DIR
 from app.core.database import get_recent_detections, get_detection_stats, get_detections_timeline, get_panel_history, get_latest_panel_data
 
-router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+# orjson serializes datetimes natively and is much faster than json.dumps
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-@router.get("/", response_class=HTMLResponse)
-async def index(request: Request):
-    """Render the main dashboard."""
-    # Detect if running locally (Flightradar24 blocks iframes on localhost)
-    is_local = request.url.hostname in ["localhost", "127.0.0.1", "0.0.0.0"]
-    
-    data = {
-        "weather": await weather.get_weather(),
-        "news": await news.get_news(),
-        "transit": await transit.get_transit(),
-        "trains": await trains.get_trains(),
-        "events": await events.get_events(),
-        "air_quality": await air_quality.get_air_quality(),
-        "markets": await markets.get_markets(),
-        "parking": await parking.get_parking(),
-        "bikes": await bikes.get_bikes(),
-        "is_local": is_local,
-    }
-    return templates.TemplateResponse("index.html", {"request": request, **data})
-
-
-# JSON API endpoints
-@router.get("/api/weather")
-async def api_weather():
-    return await weather.get_weather()
-
-
-@router.get("/api/news")
-async def api_news():
-    return await news.get_news()
-
-
-@router.get("/api/transit")
-async def api_transit():
-    return await transit.get_transit()
-
-
-@router.get("/api/trains")
-async def api_trains():
-    return await trains.get_trains()
-
-
-@router.get("/api/events")
-async def api_events():
-    return await events.get_events()
-
-
-@router.get("/api/air_quality")
-async def api_air_quality():
-    return await air_quality.get_air_quality()
-
-
-@router.get("/api/markets")
-async def api_markets():
-    return await markets.get_markets()
-
-
-@router.get("/api/parking")
-async def api_parking():
-    return await parking.get_parking()
-
-
-@router.get("/api/bikes")
-async def api_bikes():
-    return await bikes.get_bikes()
-
+def create_template_env() -> jinja2.Environment:
+    """Jinja environment; production skips reload checks and caches bytecode on disk.
 
-# Partial templates for htmx updates
-@router.get("/partial/weather", response_class=HTMLResponse)
-async def partial_weather(request: Request):
-    data = await weather.get_weather()
-    return templates.TemplateResponse("partials/weather.html", {"request": request, "weather": data})
+    Async mode lets renders yield to the event loop, so templates must be
+    rendered with render_async().
+    """
+    options = {}
+    if IS_PRODUCTION:
+        os.makedirs(JINJA_BYTECODE_DIR, exist_ok=True)
+        options = {
+            "auto_reload": False,
+            "cache_size": 400,
+            "bytecode_cache": jinja2.FileSystemBytecodeCache(JINJA_BYTECODE_DIR),
+        }
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader("app/templates"), autoescape=True, enable_async=True, **options,
+    )
 
 
-@router.get("/partial/news", response_class=HTMLResponse)
-async def partial_news(request: Request):
-    data = await news.get_news()
-    return templates.TemplateResponse("partials/news.html", {"request": request, "news": data})
+templates = Jinja2Templates(env=create_template_env())
 
+# Flightradar24 blocks iframes on these hosts
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "0.0.0.0"})
 
-@router.get("/partial/transit", response_class=HTMLResponse)
-async def partial_transit(request: Request):
-    data = await transit.get_transit()
-    return templates.TemplateResponse("partials/transit.html", {"request": request, "transit": data})
 
+@router.get("/", response_class=HTMLResponse)
+async def index(request: Request):
+    """Render the main dashboard."""
+    is_local = request.url.hostname in LOCAL_HOSTS
+    headers = {"Cache-Control": f"public, max-age={INDEX_MAX_AGE}"}
+
+    # Every panel unchanged since the client's copy: skip fetching and rendering
+    etag = composite_etag(dashboard.DASHBOARD_PANEL_NAMES, str(is_local))
+    if etag and etag_matches(request, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    data = await dashboard.fetch_all_panels()
+    data["is_local"] = is_local
+    etag = composite_etag(dashboard.DASHBOARD_PANEL_NAMES, str(is_local))
+    if etag:
+        headers["ETag"] = etag
+    return HTMLResponse(
+        await INDEX_TEMPLATE.render_async({"request": request, **data}),
+        headers=headers,
+    )
+
+
+# Panels served as /api/<name> (JSON) and /partial/<name> (htmx HTML).
+# Each partial renders partials/<name>.html with the data under <name>.
+PANELS = {
+    "weather": weather.get_weather,
+    "news": news.get_news,
+    "transit": transit.get_transit,
+    "trains": trains.get_trains,
+    "events": events.get_events,
+    "air_quality": air_quality.get_air_quality,
+    "markets": markets.get_markets,
+    "parking": parking.get_parking,
+    "bikes": bikes.get_bikes,
+    "emergency": emergency.get_emergency_data,
+    "flights": flights.get_flights,
+    "ticker": ticker.get_ticker_data,
+}
 
-@router.get("/partial/trains", response_class=HTMLResponse)
-async def partial_trains(request: Request):
-    data = await trains.get_trains()
-    return templates.TemplateResponse("partials/trains.html", {"request": request, "trains": data})
-
-
-@router.get("/partial/events", response_class=HTMLResponse)
-async def partial_events(request: Request):
-    data = await events.get_events()
-    return templates.TemplateResponse("partials/events.html", {"request": request, "events": data})
-
-
-@router.get("/partial/air_quality", response_class=HTMLResponse)
-async def partial_air_quality(request: Request):
-    data = await air_quality.get_air_quality()
-    return templates.TemplateResponse("partials/air_quality.html", {"request": request, "air_quality": data})
-
+# Resolve templates once at import instead of a loader lookup per render
+INDEX_TEMPLATE = templates.get_template("index.html")
+TEMPLATES = {
+    name: templates.get_template(f"partials/{name}.html")
+    for name in (*PANELS, "cameras", "vision_detection", "ai_detection")
+}
 
-@router.get("/partial/markets", response_class=HTMLResponse)
-async def partial_markets(request: Request):
-    data = await markets.get_markets()
-    return templates.TemplateResponse("partials/markets.html", {"request": request, "markets": data})
 
+def make_api(panel: str, getter):
+    """Build the JSON endpoint for a panel."""
+    @conditional(panel)
+    async def api_panel():
+        return await getter()
+    return api_panel
 
-@router.get("/partial/parking", response_class=HTMLResponse)
-async def partial_parking(request: Request):
-    data = await parking.get_parking()
-    return templates.TemplateResponse("partials/parking.html", {"request": request, "parking": data})
 
+def make_partial(panel: str, getter):
+    """Build the htmx partial endpoint for a panel."""
+    template = TEMPLATES[panel]
 
-@router.get("/partial/bikes", response_class=HTMLResponse)
-async def partial_bikes(request: Request):
-    data = await bikes.get_bikes()
-    return templates.TemplateResponse("partials/bikes.html", {"request": request, "bikes": data})
+    @conditional(panel)
+    async def partial_panel(request: Request):
+        data = await getter()
+        return HTMLResponse(await template.render_async({"request": request, panel: data}))
+    return partial_panel
 
 
-# New wild features
-@router.get("/api/emergency")
-async def api_emergency():
-    return await emergency.get_emergency_data()
+for _name, _getter in PANELS.items():
+    router.add_api_route(f"/api/{_name}", make_api(_name, _getter), methods=["GET"], name=f"api_{_name}")
+    router.add_api_route(
+        f"/partial/{_name}", make_partial(_name, _getter), methods=["GET"],
+        response_class=HTMLResponse, name=f"partial_{_name}",
+    )
 
 
 @router.get("/api/cameras")
 async def api_cameras():
-    return await cameras.get_cameras_data()
-
+    # Static payload, pre-serialized at import
+    return Response(content=cameras.CAMERAS_JSON, media_type="application/json")
 
-@router.get("/api/flights")
-async def api_flights():
-    return await flights.get_flights_data()
 
+def make_cameras_partial(panel_index: int, panel_suffix: str):
+    """Build the partial endpoint for one of the camera panels."""
+    template = TEMPLATES["cameras"]
+    panel_context = {"panel_suffix": panel_suffix}
 
-@router.get("/api/ticker")
-async def api_ticker():
-    return await ticker.get_ticker_data()
+    async def partial_cameras(request: Request):
+        data = await cameras.get_cameras_data(panel_index=panel_index)
+        return HTMLResponse(await template.render_async(panel_context, request=request, cameras=data))
+    return partial_cameras
 
 
-@router.get("/partial/emergency", response_class=HTMLResponse)
-async def partial_emergency(request: Request):
-    data = await emergency.get_emergency_data()
-    return templates.TemplateResponse("partials/emergency.html", {"request": request, "emergency": data})
-
-
-@router.get("/partial/cameras", response_class=HTMLResponse)
-async def partial_cameras(request: Request):
-    data = await cameras.get_cameras_data(panel_index=0)
-    return templates.TemplateResponse("partials/cameras.html", {"request": request, "cameras": data, "panel_suffix": ""})
-
-
-@router.get("/partial/cameras2", response_class=HTMLResponse)
-async def partial_cameras2(request: Request):
-    data = await cameras.get_cameras_data(panel_index=1)
-    return templates.TemplateResponse("partials/cameras.html", {"request": request, "cameras": data, "panel_suffix": "2"})
-
-
-@router.get("/partial/flights", response_class=HTMLResponse)
-async def partial_flights(request: Request):
-    data = await flights.get_flights_data()
-    return templates.TemplateResponse("partials/flights.html", {"request": request, "flights": data})
-
-
-@router.get("/partial/ticker", response_class=HTMLResponse)
-async def partial_ticker(request: Request):
-    data = await ticker.get_ticker_data()
-    return templates.TemplateResponse("partials/ticker.html", {"request": request, "ticker": data})
+# Camera panels share a template; the URL suffix picks the starting camera
+for _index, _suffix in enumerate(("", "2")):
+    router.add_api_route(
+        f"/partial/cameras{_suffix}", make_cameras_partial(_index, _suffix), methods=["GET"],
+        response_class=HTMLResponse, name=f"partial_cameras{_suffix}",
+    )
 
 
 @router.get("/api/traffic")
+@conditional("traffic")
 async def api_traffic():
     """Get ANWB traffic jams and incidents"""
     return await traffic.get_traffic()
@@ -213,7 +169,7 @@ async def api_vision_detection(camera_id: str):
 async def partial_vision_detection(request: Request, camera_id: str):
     """Get vision detection HTML partial"""
     data = await vision.get_camera_detections(camera_id)
-    return templates.TemplateResponse("partials/vision_detection.html", {"request": request, "detection": data})
+    return HTMLResponse(await TEMPLATES["vision_detection"].render_async({"request": request, "detection": data}))
 
 
 @router.get("/api/vision/{camera_id}/image")
@@ -228,36 +184,25 @@ async def api_vision_image(camera_id: str):
 @router.get("/partial/ai_detection/{camera_id}", response_class=HTMLResponse)
 async def partial_ai_detection(request: Request, camera_id: str):
     """Get AI detection panel HTML partial"""
-    return templates.TemplateResponse("partials/ai_detection.html", {
+    return HTMLResponse(await TEMPLATES["ai_detection"].render_async({
         "request": request,
         "camera_id": camera_id,
         "panel_suffix": f"_{camera_id}"
-    })
+    }))
 
 
 @router.get("/api/detections")
 async def api_detections(camera_id: Optional[str] = None, limit: int = 100):
     """Get recent detections from database"""
     detections = await get_recent_detections(camera_id=camera_id, limit=limit)
-    # Convert datetime objects to strings for JSON serialization
-    for d in detections:
-        if d.get('detected_at'):
-            d['detected_at'] = d['detected_at'].isoformat()
-    return {"detections": detections, "count": len(detections)}
+    # Return the response directly so rows go straight to orjson (no jsonable_encoder pass)
+    return ORJSONResponse({"detections": detections, "count": len(detections)})
 
 
 @router.get("/api/detections/stats")
 async def api_detection_stats(camera_id: Optional[str] = None):
     """Get detection statistics"""
-    stats = await get_detection_stats(camera_id=camera_id)
-    # Convert datetime objects to strings
-    if stats.get('first_detection'):
-        stats['first_detection'] = stats['first_detection'].isoformat()
-    if stats.get('last_detection'):
-        stats['last_detection'] = stats['last_detection'].isoformat()
-    if stats.get('avg_objects'):
-        stats['avg_objects'] = float(stats['avg_objects'])
-    return stats
+    return await get_detection_stats(camera_id=camera_id)
 
 
 @router.get("/api/detections/timeline")
@@ -269,36 +214,37 @@ async def api_detections_timeline(hours: int = 24):
 @router.get("/api/map/flights")
 async def api_map_flights():
     """Get live flight positions from FlightRadar24"""
-    return await flightradar.get_flight_positions()
+    return Response(content=await flightradar.get_flight_positions_json(), media_type="application/json")
 
 
 # Historical data endpoints
-VALID_PANELS = {
+VALID_PANELS = frozenset({
     "weather", "news", "transit", "trains", "events", "air_quality",
     "markets", "parking", "bikes", "flights", "emergency", "traffic"
-}
+})
+INVALID_PANEL_ERROR = {"error": f"Invalid panel. Valid panels: {', '.join(sorted(VALID_PANELS))}"}
 
 
 @router.get("/api/history/{panel_name}")
 async def api_panel_history(panel_name: str, hours: int = 24, limit: int = 100):
     """Get historical data for a panel (requires DATABASE_URL)"""
     if panel_name not in VALID_PANELS:
-        return {"error": f"Invalid panel. Valid panels: {', '.join(sorted(VALID_PANELS))}"}
+        return INVALID_PANEL_ERROR
 
     history = await get_panel_history(panel_name, hours=hours, limit=limit)
-    return {
+    return ORJSONResponse({
         "panel": panel_name,
         "hours": hours,
         "count": len(history),
         "history": history
-    }
+    })
 
 
 @router.get("/api/history/{panel_name}/latest")
 async def api_panel_latest_from_db(panel_name: str):
     """Get the most recent data for a panel from database (fallback endpoint)"""
     if panel_name not in VALID_PANELS:
-        return {"error": f"Invalid panel. Valid panels: {', '.join(sorted(VALID_PANELS))}"}
+        return INVALID_PANEL_ERROR
 
     data = await get_latest_panel_data(panel_name)
     if data:
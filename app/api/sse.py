@@ -1,20 +1,27 @@
 import asyncio
 from fastapi import APIRouter
 from sse_starlette.sse import EventSourceResponse
-from app.core.scheduler import sse_clients
+from app.core import scheduler
+from app.core.scheduler import panel_event, panels_updated_since
 
 router = APIRouter()
 
 
-async def event_generator(queue: asyncio.Queue):
-    """Generate SSE events from the queue."""
+async def event_generator():
+    """Generate SSE events for panels updated since the last wake-up."""
+    seen_version = scheduler.update_version
     try:
         while True:
-            panel = await queue.get()
-            yield {
-                "event": "update",
-                "data": panel,
-            }
+            # Only wait when caught up; updates made while we were yielding
+            # are picked up by the version check instead of the Event
+            if scheduler.update_version == seen_version:
+                await panel_event.wait()
+            seen_version, panels = panels_updated_since(seen_version)
+            for panel in panels:
+                yield {
+                    "event": "update",
+                    "data": panel,
+                }
     except asyncio.CancelledError:
         pass
 
@@ -22,13 +29,7 @@ async def event_generator(queue: asyncio.Queue):
 @router.get("/sse/updates")
 async def sse_updates():
     """SSE endpoint for real-time panel updates."""
-    queue = asyncio.Queue()
-    sse_clients.add(queue)
-
-    async def cleanup():
-        sse_clients.discard(queue)
-
     return EventSourceResponse(
-        event_generator(queue),
+        event_generator(),
         ping=30,
     )
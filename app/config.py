@@ -1,4 +1,5 @@
 import os
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
@@ -13,10 +14,42 @@ def amsterdam_now() -> datetime:
     """Get current datetime in Amsterdam timezone."""
     return datetime.now(AMSTERDAM_TZ)
 
+
+# (monotonic time, ISO string, HH:MM:SS) of the last clock read
+_now_strings = (0.0, "", "")
+
+
+def _amsterdam_now_strings() -> tuple[float, str, str]:
+    """Formatted current Amsterdam time, re-read from the clock at most once per second."""
+    global _now_strings
+    now = time.monotonic()
+    if now - _now_strings[0] >= 1.0 or not _now_strings[1]:
+        dt = datetime.now(AMSTERDAM_TZ)
+        _now_strings = (now, dt.isoformat(), f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}")
+    return _now_strings
+
+
+def amsterdam_now_iso_cached() -> str:
+    """Get the current Amsterdam time as an ISO string, reused for up to 1 second.
+
+    For payload timestamps where second precision is enough; use
+    amsterdam_now() when an actual datetime is needed.
+    """
+    return _amsterdam_now_strings()[1]
+
+
+def amsterdam_now_hms_cached() -> str:
+    """Get the current Amsterdam time as HH:MM:SS, reused for up to 1 second."""
+    return _amsterdam_now_strings()[2]
+
 # Amsterdam coordinates
 AMSTERDAM_LAT = 52.3676
 AMSTERDAM_LON = 4.9041
 
+# Deployment environment ("production" enables template caching)
+IS_PRODUCTION = os.getenv("ENV") == "production"
+JINJA_BYTECODE_DIR = os.getenv("JINJA_BYTECODE_DIR", "/tmp/jinja_bc")
+
 # API Keys (optional - most work without)
 TICKETMASTER_API_KEY = os.getenv("TICKETMASTER_API_KEY", "")
 
@@ -65,4 +98,5 @@ CACHE_TTL = {
     "vision": 330,      # 5.5 min cache (slightly longer than refresh)
     "emergency": 90,
     "traffic": 700,     # 11.5 min (Selenium source)
+    "flightradar": 30,
 }
@@ -1,42 +1,101 @@
+import asyncio
 import time
-from typing import Any, Optional
-import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+_NS_PER_SECOND = 1_000_000_000
+
+# Least recently used keys are evicted beyond this many entries
+MAXSIZE = 1024
+
+# stale_ttl for get_or_fetch: serve any cached value, only block on a cold cache
+ALWAYS_STALE = float("inf")
+
 
 class TTLCache:
-    """Simple in-memory cache with TTL support."""
+    """Simple in-memory cache with TTL support.
 
-    def __init__(self):
-        self._cache: dict[str, dict[str, Any]] = {}
-        self._lock = threading.Lock()
+    Entries are (value, expires_at, updated_at) tuples. Expiry uses the
+    monotonic clock so NTP adjustments can't expire or resurrect entries;
+    updated_at stays wall-clock time because it is exposed to HTTP clients.
+    Expired entries are kept until overwritten or evicted so get_or_fetch
+    can serve them stale while it refreshes; size is capped by LRU eviction.
+    No lock is needed for get/set: single-key dict reads and writes are
+    atomic under the GIL, and the cache is only used from the event loop.
+    """
 
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired."""
-        with self._lock:
-            if key not in self._cache:
-                return None
+    def __init__(self, maxsize: int = MAXSIZE):
+        self.maxsize = maxsize
+        self._cache: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refreshes: dict[str, asyncio.Task] = {}
 
-            entry = self._cache[key]
-            if time.time() > entry["expires_at"]:
-                del self._cache[key]
-                return None
+    def _live_entry(self, key: str) -> Optional[tuple[Any, int, float]]:
+        """Get the raw entry for key, or None if missing or expired."""
+        entry = self._cache.get(key)
+        if entry is None or time.monotonic_ns() > entry[1]:
+            return None
+        return entry
 
-            return entry["value"]
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if not expired."""
+        entry = self._live_entry(key)
+        if entry is None:
+            return None
+        self._cache.move_to_end(key)
+        return entry[0]
 
     def set(self, key: str, value: Any, ttl: int) -> None:
         """Set value in cache with TTL in seconds."""
-        with self._lock:
-            self._cache[key] = {
-                "value": value,
-                "expires_at": time.time() + ttl,
-                "updated_at": time.time()
-            }
+        expires_at = time.monotonic_ns() + int(ttl * _NS_PER_SECOND)
+        self._cache[key] = (value, expires_at, time.time())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
 
     def get_updated_at(self, key: str) -> Optional[float]:
-        """Get the timestamp when the key was last updated."""
-        with self._lock:
-            if key in self._cache:
-                return self._cache[key].get("updated_at")
-            return None
+        """Get the timestamp when the key was last updated (None if expired)."""
+        entry = self._live_entry(key)
+        return entry[2] if entry else None
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]], stale_ttl: int = 0) -> Any:
+        """Get value from cache, fetching it if needed.
+
+        `fetch` must store its result in the cache itself (the services'
+        fetch_* functions do, and skip it on errors). Only one fetch per key
+        runs at a time; concurrent callers wait for it instead of hitting the
+        upstream again. Up to stale_ttl seconds past expiry the old value is
+        returned immediately and refreshed in the background (ALWAYS_STALE:
+        no limit, so callers only wait when nothing is cached).
+        """
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            now = time.monotonic_ns()
+            if now <= entry[1]:
+                return entry[0]
+            if now <= entry[1] + stale_ttl * _NS_PER_SECOND:
+                if key not in self._refreshes:
+                    task = asyncio.create_task(self._refresh(key, fetch))
+                    self._refreshes[key] = task
+                    task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+                return entry[0]
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            # Another caller may have fetched it while we waited
+            value = self.get(key)
+            if value is not None:
+                return value
+            return await fetch()
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """Background refresh for a stale key."""
+        try:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                if self._live_entry(key) is None:
+                    await fetch()
+        except Exception as e:
+            print(f"Error refreshing {key}: {e}")
 
 
 # Global cache instance
@@ -1,45 +1,122 @@
 """Database module for PostgreSQL connection and detection storage"""
 import os
+import asyncio
 import asyncpg
-import json
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import orjson
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple
 from app.config import amsterdam_now
 
-# Database connection pool
+# Database connection pool, created once by init_db at startup
 _pool: Optional[asyncpg.Pool] = None
 
+# Panel snapshots are queued and written in batches by a background task
+PANEL_WRITE_BATCH_SIZE = 50
+PANEL_WRITE_MAX_DELAY = 0.25  # seconds to wait for a batch to fill
+_panel_write_queue: Optional[asyncio.Queue] = None
+_panel_writer_task: Optional[asyncio.Task] = None
 
-async def get_pool() -> Optional[asyncpg.Pool]:
-    """Get or create database connection pool"""
-    global _pool
+# panel_cache is range-partitioned by day; retention drops whole partitions
+PANEL_PARTITION_PREFIX = "panel_cache_"
+PANEL_PARTITION_DAYS_AHEAD = 2
+PANEL_DELETE_BATCH_SIZE = 10000
+
+# One-time migrations and backfills at startup can rewrite or scan whole
+# tables, far beyond the pool's command_timeout
+MIGRATION_TIMEOUT = 1800
+
+# Whether detections.object_count is the generated column. Until its
+# migration succeeds it is a plain column that save_detection must fill.
+_object_count_generated = True
+
+
+def _json_dumps(value: Any) -> bytes:
+    """Serialize to JSON for a JSONB parameter (non-str keys are stringified)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Binary JSONB wire format: version byte 1 + JSON text.
+
+    bytes and str are taken as already-serialized JSON (like asyncpg's default
+    text codec), so callers can't store a JSON string of JSON by accident.
+    """
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, bytes):
+        value = _json_dumps(value)
+    return b"\x01" + value
 
-    if _pool is not None:
-        return _pool
 
+def _decode_jsonb(value: bytes) -> Any:
+    """Parse binary JSONB (skipping the version byte)"""
+    return orjson.loads(value[1:])
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Per-connection setup: exchange JSONB in binary and (de)serialize with orjson"""
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+
+
+def get_pool() -> Optional[asyncpg.Pool]:
+    """Get the connection pool created by init_db (None if the database is disabled)"""
+    return _pool
+
+
+async def _create_pool() -> Optional[asyncpg.Pool]:
+    """Create the database connection pool"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         print("[DB] DATABASE_URL not set, detection history disabled")
         return None
 
     try:
-        _pool = await asyncpg.create_pool(
+        pool = await asyncpg.create_pool(
             database_url,
             min_size=1,
             max_size=5,
-            command_timeout=10
+            command_timeout=10,
+            # asyncpg prepares each query once per connection and reuses it by
+            # SQL text, so the fixed queries here skip parse/plan after first use
+            statement_cache_size=100,
+            init=_init_connection,
         )
         print(f"[DB] Connected to PostgreSQL")
-        return _pool
+        return pool
     except Exception as e:
         print(f"[DB] Failed to connect: {e}")
         return None
 
 
+async def _run_migration(conn: asyncpg.Connection, description: str, sql: str) -> None:
+    """Run a one-time migration with a long timeout; failures are logged so startup continues"""
+    try:
+        await conn.execute(sql, timeout=MIGRATION_TIMEOUT)
+    except Exception as e:
+        print(f"[DB] {description} failed: {e}")
+
+
+async def _object_count_is_generated(conn: asyncpg.Connection) -> bool:
+    """Whether detections.object_count is derived from objects by Postgres"""
+    return bool(await conn.fetchval("""
+        SELECT attgenerated = 's' FROM pg_attribute
+        WHERE attrelid = 'detections'::regclass AND attname = 'object_count'
+    """))
+
+
 async def init_db():
-    """Initialize database tables"""
-    pool = await get_pool()
-    if not pool:
+    """Connect and initialize database tables"""
+    global _pool
+    if _pool is None:
+        _pool = await _create_pool()
+    pool = _pool
+    if pool is None:
         return
 
     async with pool.acquire() as conn:
@@ -49,29 +126,103 @@ async def init_db():
                 id SERIAL PRIMARY KEY,
                 camera_id VARCHAR(50) NOT NULL,
                 detected_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                object_count INTEGER NOT NULL DEFAULT 0,
                 objects JSONB NOT NULL DEFAULT '[]',
+                object_count INTEGER GENERATED ALWAYS AS (jsonb_array_length(objects)) STORED,
                 summary JSONB NOT NULL DEFAULT '{}',
                 source VARCHAR(50),
                 frame_size INTEGER
             )
         """)
 
+        # Older tables stored object_count by hand; derive it from objects instead
+        global _object_count_generated
+        _object_count_generated = await _object_count_is_generated(conn)
+        if not _object_count_generated:
+            # Rewrites the table; retried on the next start if it fails, and
+            # save_detection keeps filling the plain column until then
+            await _run_migration(conn, "object_count migration", """
+                ALTER TABLE detections
+                DROP COLUMN object_count,
+                ADD COLUMN object_count INTEGER GENERATED ALWAYS AS (jsonb_array_length(objects)) STORED
+            """)
+            _object_count_generated = await _object_count_is_generated(conn)
+
         # Create index on camera_id and timestamp for fast queries
         await conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_detections_camera_time
             ON detections (camera_id, detected_at DESC)
         """)
 
-        # Create panel_cache table for all dashboard data
+        # BRIN index for time-range scans across all cameras (append-only, so tiny and cheap)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_detections_time_brin
+            ON detections USING BRIN (detected_at) WITH (pages_per_range = 32)
+        """)
+
+        # Per-category counts from detections.summary as typed rows, so the
+        # timeline can aggregate without walking JSONB
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS detection_summary (
+                detection_id INTEGER NOT NULL REFERENCES detections (id) ON DELETE CASCADE,
+                detected_at TIMESTAMPTZ NOT NULL,
+                category VARCHAR(50) NOT NULL,
+                count INTEGER NOT NULL
+            )
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_detection_summary_time_brin
+            ON detection_summary USING BRIN (detected_at) WITH (pages_per_range = 32)
+        """)
+
+        # Backfill once for detections stored before the table existed
+        await _run_migration(conn, "detection_summary backfill", """
+            INSERT INTO detection_summary (detection_id, detected_at, category, count)
+            SELECT d.id, d.detected_at, s.key, s.value::int
+            FROM detections d, jsonb_each(d.summary) s
+            WHERE NOT EXISTS (SELECT 1 FROM detection_summary)
+        """)
+
+        # Per-camera daily rollup of detections, kept current by save_detection,
+        # so stats scan a few rows per day instead of the whole detection log
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS detections_daily (
+                camera_id VARCHAR(50) NOT NULL,
+                day DATE NOT NULL,
+                cnt INTEGER NOT NULL,
+                sum_obj BIGINT NOT NULL,
+                max_obj INTEGER NOT NULL,
+                first_at TIMESTAMPTZ NOT NULL,
+                last_at TIMESTAMPTZ NOT NULL,
+                PRIMARY KEY (camera_id, day)
+            )
+        """)
+
+        # Backfill once for detections stored before the table existed
+        await _run_migration(conn, "detections_daily backfill", """
+            INSERT INTO detections_daily (camera_id, day, cnt, sum_obj, max_obj, first_at, last_at)
+            SELECT camera_id, (detected_at AT TIME ZONE 'Europe/Amsterdam')::date,
+                   COUNT(*), SUM(object_count), MAX(object_count), MIN(detected_at), MAX(detected_at)
+            FROM detections
+            WHERE NOT EXISTS (SELECT 1 FROM detections_daily)
+            GROUP BY 1, 2
+        """)
+
+        # Create panel_cache table for all dashboard data, partitioned by day.
+        # Tables created before partitioning stay as they are (see cleanup).
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS panel_cache (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 panel_name VARCHAR(50) NOT NULL,
                 fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                data JSONB NOT NULL DEFAULT '{}'
-            )
+                data JSONB NOT NULL DEFAULT '{}',
+                PRIMARY KEY (id, fetched_at)
+            ) PARTITION BY RANGE (fetched_at)
         """)
+        if await _panel_cache_partitioned(conn):
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS panel_cache_default PARTITION OF panel_cache DEFAULT
+            """)
+            await _create_panel_partitions(conn)
 
         # Create index for fast lookups by panel and time
         await conn.execute("""
@@ -79,8 +230,47 @@ async def init_db():
             ON panel_cache (panel_name, fetched_at DESC)
         """)
 
+        # BRIN index for retention cleanup, which filters on fetched_at alone
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_panel_cache_time_brin
+            ON panel_cache USING BRIN (fetched_at) WITH (pages_per_range = 32)
+        """)
+
+        # Latest snapshot per panel, kept up to date on every save (PK lookup)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS panel_latest (
+                panel_name VARCHAR(50) PRIMARY KEY,
+                fetched_at TIMESTAMPTZ NOT NULL,
+                data JSONB NOT NULL
+            )
+        """)
+
+        # Seed it from history for databases that predate the table
+        await _run_migration(conn, "panel_latest seed", """
+            INSERT INTO panel_latest (panel_name, fetched_at, data)
+            SELECT DISTINCT ON (panel_name) panel_name, fetched_at, data
+            FROM panel_cache
+            ORDER BY panel_name, fetched_at DESC
+            ON CONFLICT (panel_name) DO NOTHING
+        """)
+
+        # Nominatim results, so geocodes survive restarts
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                address TEXT PRIMARY KEY,
+                lat DOUBLE PRECISION NOT NULL,
+                lng DOUBLE PRECISION NOT NULL,
+                geocoded_at TIMESTAMPTZ DEFAULT NOW()
+            )
+        """)
+
         print("[DB] Tables initialized")
 
+    global _panel_write_queue, _panel_writer_task
+    if _panel_writer_task is None:
+        _panel_write_queue = asyncio.Queue()
+        _panel_writer_task = asyncio.create_task(_panel_writer())
+
 
 async def save_detection(
     camera_id: str,
@@ -90,38 +280,71 @@ async def save_detection(
     frame_size: Optional[int] = None
 ) -> Optional[int]:
     """Save a detection result to database"""
-    pool = await get_pool()
-    if not pool:
+    pool = _pool
+    if pool is None:
         return None
 
     try:
-        async with pool.acquire() as conn:
-            result = await conn.fetchrow("""
-                INSERT INTO detections (camera_id, detected_at, object_count, objects, summary, source, frame_size)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                RETURNING id
-            """,
-                camera_id,
-                amsterdam_now(),
-                len(objects),
-                json.dumps(objects),
-                json.dumps(summary),
-                source,
-                frame_size
-            )
-            return result['id'] if result else None
+        detected_at = amsterdam_now()
+        async with pool.acquire() as conn, conn.transaction():
+            if _object_count_generated:
+                result = await conn.fetchrow("""
+                    INSERT INTO detections (camera_id, detected_at, objects, summary, source, frame_size)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    RETURNING id
+                """, camera_id, detected_at, objects, summary, source, frame_size)
+            else:
+                result = await conn.fetchrow("""
+                    INSERT INTO detections (camera_id, detected_at, objects, summary, source, frame_size, object_count)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    RETURNING id
+                """, camera_id, detected_at, objects, summary, source, frame_size, len(objects))
+            if not result:
+                return None
+            await conn.execute("""
+                INSERT INTO detections_daily (camera_id, day, cnt, sum_obj, max_obj, first_at, last_at)
+                VALUES ($1, $2, 1, $3, $3, $4, $4)
+                ON CONFLICT (camera_id, day) DO UPDATE SET
+                    cnt = detections_daily.cnt + 1,
+                    sum_obj = detections_daily.sum_obj + EXCLUDED.sum_obj,
+                    max_obj = GREATEST(detections_daily.max_obj, EXCLUDED.max_obj),
+                    first_at = LEAST(detections_daily.first_at, EXCLUDED.first_at),
+                    last_at = GREATEST(detections_daily.last_at, EXCLUDED.last_at)
+            """, camera_id, detected_at.date(), len(objects), detected_at)
+            if summary:
+                await conn.copy_records_to_table(
+                    "detection_summary",
+                    columns=["detection_id", "detected_at", "category", "count"],
+                    records=[(result['id'], detected_at, category, count) for category, count in summary.items()],
+                )
+            return result['id']
     except Exception as e:
         print(f"[DB] Error saving detection: {e}")
         return None
 
 
+# Column order of the detection / history SELECTs, for building row dicts
+DETECTION_COLUMNS = ("id", "camera_id", "detected_at", "object_count", "summary", "source")
+PANEL_HISTORY_COLUMNS = ("id", "fetched_at", "data")
+
+DETECTION_STATS_SQL = """
+    SELECT
+        COALESCE(SUM(cnt), 0)::int8 as total_detections,
+        (SUM(sum_obj)::float8 / NULLIF(SUM(cnt), 0)) as avg_objects,
+        MAX(max_obj) as max_objects,
+        MIN(first_at) as first_detection,
+        MAX(last_at) as last_detection
+    FROM detections_daily
+"""
+
+
 async def get_recent_detections(
     camera_id: Optional[str] = None,
     limit: int = 100
 ) -> List[Dict[str, Any]]:
     """Get recent detections, optionally filtered by camera"""
-    pool = await get_pool()
-    if not pool:
+    pool = _pool
+    if pool is None:
         return []
 
     try:
@@ -142,7 +365,7 @@ async def get_recent_detections(
                     LIMIT $1
                 """, limit)
 
-            return [dict(row) for row in rows]
+            return [dict(zip(DETECTION_COLUMNS, row)) for row in rows]
     except Exception as e:
         print(f"[DB] Error fetching detections: {e}")
         return []
@@ -150,33 +373,17 @@ async def get_recent_detections(
 
 async def get_detection_stats(camera_id: Optional[str] = None) -> Dict[str, Any]:
     """Get detection statistics"""
-    pool = await get_pool()
-    if not pool:
+    pool = _pool
+    if pool is None:
         return {}
 
     try:
         async with pool.acquire() as conn:
+            # Answered from the daily rollup rather than scanning detections
             if camera_id:
-                row = await conn.fetchrow("""
-                    SELECT
-                        COUNT(*) as total_detections,
-                        AVG(object_count) as avg_objects,
-                        MAX(object_count) as max_objects,
-                        MIN(detected_at) as first_detection,
-                        MAX(detected_at) as last_detection
-                    FROM detections
-                    WHERE camera_id = $1
-                """, camera_id)
+                row = await conn.fetchrow(DETECTION_STATS_SQL + " WHERE camera_id = $1", camera_id)
             else:
-                row = await conn.fetchrow("""
-                    SELECT
-                        COUNT(*) as total_detections,
-                        AVG(object_count) as avg_objects,
-                        MAX(object_count) as max_objects,
-                        MIN(detected_at) as first_detection,
-                        MAX(detected_at) as last_detection
-                    FROM detections
-                """)
+                row = await conn.fetchrow(DETECTION_STATS_SQL)
 
             return dict(row) if row else {}
     except Exception as e:
@@ -186,91 +393,131 @@ async def get_detection_stats(camera_id: Optional[str] = None) -> Dict[str, Any]
 
 async def get_detections_timeline(hours: int = 24) -> Dict[str, Any]:
     """Get hourly aggregated detection counts by category"""
-    pool = await get_pool()
-    if not pool:
+    pool = _pool
+    if pool is None:
         return {"labels": [], "categories": {}}
 
     try:
         async with pool.acquire() as conn:
-            # Query to extract and aggregate categories from summary JSONB
-            rows = await conn.fetch("""
+            # Aggregate per (hour, category) and fill missing hours with 0 in SQL,
+            # returning the finished labels + per-category arrays in one row
+            row = await conn.fetchrow("""
+                WITH hours AS (
+                    SELECT generate_series(
+                        date_trunc('hour', NOW() - INTERVAL '1 hour' * $1),
+                        date_trunc('hour', NOW()),
+                        INTERVAL '1 hour'
+                    ) AS hour
+                ),
+                counts AS (
+                    SELECT
+                        date_trunc('hour', detected_at) as hour,
+                        category,
+                        SUM(count) as total_count
+                    FROM detection_summary
+                    WHERE detected_at > NOW() - INTERVAL '1 hour' * $1
+                    GROUP BY 1, 2
+                ),
+                series AS (
+                    SELECT c.category, jsonb_agg(COALESCE(n.total_count, 0) ORDER BY h.hour) as counts
+                    FROM (SELECT DISTINCT category FROM counts) c
+                    CROSS JOIN hours h
+                    LEFT JOIN counts n ON n.category = c.category AND n.hour = h.hour
+                    GROUP BY c.category
+                )
                 SELECT
-                    date_trunc('hour', detected_at) as hour,
-                    key as category,
-                    SUM(value::int) as total_count
-                FROM detections,
-                     jsonb_each_text(summary::jsonb)
-                WHERE detected_at > NOW() - INTERVAL '1 hour' * $1
-                GROUP BY hour, key
-                ORDER BY hour, key
+                    (SELECT jsonb_agg(to_char(hour AT TIME ZONE 'UTC', 'HH24:MI') ORDER BY hour) FROM hours) as labels,
+                    (SELECT jsonb_object_agg(category, counts) FROM series) as categories
             """, hours)
 
-            # Build timeline data structure
-            hours_set: set = set()
-            categories_data: Dict[str, Dict[str, int]] = {}
-
-            for row in rows:
-                hour_str = row['hour'].strftime('%H:%M')
-                category = row['category']
-                hours_set.add(hour_str)
-
-                if category not in categories_data:
-                    categories_data[category] = {}
-                categories_data[category][hour_str] = row['total_count']
-
-            # Sort hours and build response
-            sorted_hours = sorted(hours_set)
-
-            # Build category arrays, fill missing hours with 0
-            categories = {}
-            for cat, hour_data in categories_data.items():
-                categories[cat] = [hour_data.get(h, 0) for h in sorted_hours]
-
             return {
-                "labels": sorted_hours,
-                "categories": categories
+                "labels": row['labels'] or [],
+                "categories": row['categories'] or {}
             }
     except Exception as e:
         print(f"[DB] Error fetching timeline: {e}")
         return {"labels": [], "categories": {}}
 
 
-async def save_panel_data(panel_name: str, data: Dict[str, Any]) -> Optional[int]:
-    """Save panel data to database for historical tracking"""
-    pool = await get_pool()
-    if not pool:
-        return None
+async def save_panel_data(panel_name: str, data: Dict[str, Any]) -> None:
+    """Queue panel data for historical tracking (written in batches)"""
+    if _panel_write_queue is None:
+        return
+    # Serialize now so later changes to the cached dict can't leak in;
+    # the JSONB codec passes the bytes through as-is
+    _panel_write_queue.put_nowait((panel_name, amsterdam_now(), _json_dumps(data)))
 
+
+async def _next_panel_batch(rows: List[tuple]) -> None:
+    """Wait for a queued row, then collect more into `rows` until the batch is full or the delay passes"""
+    rows.append(await _panel_write_queue.get())
+    deadline = asyncio.get_running_loop().time() + PANEL_WRITE_MAX_DELAY
+    # asyncio.timeout rather than wait_for: on 3.11 wait_for can swallow a
+    # cancel that races with a get() completing, and the writer never stops
     try:
-        async with pool.acquire() as conn:
-            result = await conn.fetchrow("""
+        async with asyncio.timeout_at(deadline):
+            while len(rows) < PANEL_WRITE_BATCH_SIZE:
+                rows.append(await _panel_write_queue.get())
+    except TimeoutError:
+        pass
+
+
+async def _write_panel_rows(rows: List[tuple]):
+    """Insert a batch of (panel_name, fetched_at, data) rows and update panel_latest"""
+    pool = _pool
+    if pool is None or not rows:
+        return
+
+    try:
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.executemany("""
                 INSERT INTO panel_cache (panel_name, fetched_at, data)
                 VALUES ($1, $2, $3)
-                RETURNING id
-            """, panel_name, amsterdam_now(), json.dumps(data))
-            return result['id'] if result else None
+            """, rows)
+            await conn.executemany("""
+                INSERT INTO panel_latest (panel_name, fetched_at, data)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (panel_name) DO UPDATE
+                SET fetched_at = EXCLUDED.fetched_at, data = EXCLUDED.data
+                WHERE panel_latest.fetched_at <= EXCLUDED.fetched_at
+            """, rows)
     except Exception as e:
-        print(f"[DB] Error saving panel data: {e}")
-        return None
+        print(f"[DB] Error saving panel data ({len(rows)} rows): {e}")
+
+
+async def _panel_writer():
+    """Background task draining the panel write queue"""
+    # Held here, not in _next_panel_batch, so rows already taken off the
+    # queue (or whose write was cut short) are still flushed on cancel
+    rows: List[tuple] = []
+    try:
+        while True:
+            await _next_panel_batch(rows)
+            await _write_panel_rows(rows)
+            rows.clear()
+    except asyncio.CancelledError:
+        # Flush the in-progress batch and whatever is still queued before shutting down
+        while not _panel_write_queue.empty():
+            rows.append(_panel_write_queue.get_nowait())
+        await _write_panel_rows(rows)
+        raise
 
 
 async def get_latest_panel_data(panel_name: str) -> Optional[Dict[str, Any]]:
     """Get the most recent data for a panel"""
-    pool = await get_pool()
-    if not pool:
+    pool = _pool
+    if pool is None:
         return None
 
     try:
         async with pool.acquire() as conn:
             row = await conn.fetchrow("""
                 SELECT data, fetched_at
-                FROM panel_cache
+                FROM panel_latest
                 WHERE panel_name = $1
-                ORDER BY fetched_at DESC
-                LIMIT 1
             """, panel_name)
             if row:
-                data = json.loads(row['data']) if isinstance(row['data'], str) else row['data']
+                data = row['data']
                 data['_fetched_at'] = row['fetched_at'].isoformat()
                 return data
             return None
@@ -285,8 +532,8 @@ async def get_panel_history(
     limit: int = 100
 ) -> List[Dict[str, Any]]:
     """Get historical data for a panel"""
-    pool = await get_pool()
-    if not pool:
+    pool = _pool
+    if pool is None:
         return []
 
     try:
@@ -300,40 +547,178 @@ async def get_panel_history(
                 LIMIT $3
             """, panel_name, hours, limit)
 
-            result = []
-            for row in rows:
-                data = json.loads(row['data']) if isinstance(row['data'], str) else row['data']
-                result.append({
-                    'id': row['id'],
-                    'fetched_at': row['fetched_at'].isoformat(),
-                    'data': data
-                })
-            return result
+            # fetched_at stays a datetime; the JSON response serializes it
+            return [dict(zip(PANEL_HISTORY_COLUMNS, row)) for row in rows]
     except Exception as e:
         print(f"[DB] Error fetching panel history: {e}")
         return []
 
 
+async def get_cached_geocode(address: str, max_age: int) -> Optional[Tuple[float, float]]:
+    """Get a stored (lat, lng) for an address if geocoded within max_age seconds"""
+    pool = _pool
+    if pool is None:
+        return None
+
+    try:
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                SELECT lat, lng
+                FROM geocode_cache
+                WHERE address = $1
+                  AND geocoded_at > NOW() - INTERVAL '1 second' * $2
+            """, address, max_age)
+            return (row['lat'], row['lng']) if row else None
+    except Exception as e:
+        print(f"[DB] Error fetching geocode: {e}")
+        return None
+
+
+async def save_geocode(address: str, lat: float, lng: float) -> None:
+    """Store a geocoded address, replacing any older result"""
+    pool = _pool
+    if pool is None:
+        return
+
+    try:
+        async with pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO geocode_cache (address, lat, lng, geocoded_at)
+                VALUES ($1, $2, $3, NOW())
+                ON CONFLICT (address) DO UPDATE
+                SET lat = EXCLUDED.lat, lng = EXCLUDED.lng, geocoded_at = EXCLUDED.geocoded_at
+            """, address, lat, lng)
+    except Exception as e:
+        print(f"[DB] Error saving geocode: {e}")
+
+
+async def _panel_cache_partitioned(conn: asyncpg.Connection) -> bool:
+    """Whether panel_cache is a partitioned table (older deployments have a plain one)"""
+    relkind = await conn.fetchval("SELECT relkind FROM pg_class WHERE oid = 'panel_cache'::regclass")
+    return relkind == "p"
+
+
+async def _create_panel_partition(conn: asyncpg.Connection, day) -> None:
+    """Create the panel_cache partition for one UTC day, if missing.
+
+    After downtime or a skipped cleanup, rows for the day can already sit in
+    the default partition, and CREATE ... PARTITION OF would then fail. So
+    the table is created standalone, those rows are moved into it, and it is
+    attached in one transaction.
+    """
+    name = f"{PANEL_PARTITION_PREFIX}{day:%Y%m%d}"
+    if await conn.fetchval("SELECT to_regclass($1)", name) is not None:
+        return
+
+    start = f"{day.isoformat()} 00:00+00"
+    end = f"{(day + timedelta(days=1)).isoformat()} 00:00+00"
+    async with conn.transaction():
+        await conn.execute(f"CREATE TABLE {name} (LIKE panel_cache INCLUDING DEFAULTS)")
+        await conn.execute(f"""
+            WITH moved AS (
+                DELETE FROM panel_cache_default
+                WHERE fetched_at >= '{start}' AND fetched_at < '{end}'
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """, timeout=MIGRATION_TIMEOUT)
+        await conn.execute(f"""
+            ALTER TABLE panel_cache ATTACH PARTITION {name}
+            FOR VALUES FROM ('{start}') TO ('{end}')
+        """, timeout=MIGRATION_TIMEOUT)
+
+
+async def _create_panel_partitions(conn: asyncpg.Connection):
+    """Create daily panel_cache partitions (UTC) for today and the next few days.
+
+    Failures are logged, not raised: rows land in the default partition
+    until the next attempt, so this must never block startup or cleanup.
+    """
+    today = datetime.now(timezone.utc).date()
+    for offset in range(PANEL_PARTITION_DAYS_AHEAD + 1):
+        day = today + timedelta(days=offset)
+        try:
+            await _create_panel_partition(conn, day)
+        except Exception as e:
+            print(f"[DB] Error creating panel_cache partition for {day}: {e}")
+
+
+async def _drop_old_panel_partitions(conn: asyncpg.Connection, days: int) -> List[str]:
+    """Drop daily panel_cache partitions that end before the retention cutoff"""
+    cutoff = datetime.now(timezone.utc).date() - timedelta(days=days)
+    names = await conn.fetch("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'panel_cache'::regclass
+    """)
+
+    dropped = []
+    for row in names:
+        suffix = row['relname'][len(PANEL_PARTITION_PREFIX):]
+        try:
+            day = datetime.strptime(suffix, "%Y%m%d").date()
+        except ValueError:
+            continue  # default partition
+        if day < cutoff:
+            await conn.execute(f"DROP TABLE IF EXISTS {row['relname']}")
+            dropped.append(row['relname'])
+    return dropped
+
+
+async def _delete_old_rows_in_batches(conn: asyncpg.Connection, table: str, days: int) -> int:
+    """Delete rows older than `days` from a plain (non-partitioned) table in short batches.
+
+    Each batch is its own statement, so no single transaction holds locks
+    or runs into the pool's command timeout on a large backlog.
+    """
+    total = 0
+    while True:
+        status = await conn.execute(f"""
+            DELETE FROM {table}
+            WHERE ctid IN (
+                SELECT ctid FROM {table}
+                WHERE fetched_at < NOW() - INTERVAL '1 day' * $1
+                LIMIT $2
+            )
+        """, days, PANEL_DELETE_BATCH_SIZE)
+        deleted = int(status.split()[-1])
+        total += deleted
+        if deleted < PANEL_DELETE_BATCH_SIZE:
+            return total
+
+
 async def cleanup_old_panel_data(days: int = 7):
     """Remove panel data older than specified days"""
-    pool = await get_pool()
-    if not pool:
+    pool = _pool
+    if pool is None:
         return
 
     try:
         async with pool.acquire() as conn:
-            result = await conn.execute("""
-                DELETE FROM panel_cache
-                WHERE fetched_at < NOW() - INTERVAL '1 day' * $1
-            """, days)
-            print(f"[DB] Cleaned up old panel data: {result}")
+            if await _panel_cache_partitioned(conn):
+                await _create_panel_partitions(conn)
+                dropped = await _drop_old_panel_partitions(conn, days)
+                # Only rows that missed a daily partition end up in the default one
+                deleted = await _delete_old_rows_in_batches(conn, "panel_cache_default", days)
+                print(f"[DB] Cleaned up old panel data: dropped {dropped}, deleted {deleted} from default")
+            else:
+                deleted = await _delete_old_rows_in_batches(conn, "panel_cache", days)
+                print(f"[DB] Cleaned up old panel data: deleted {deleted} rows")
     except Exception as e:
         print(f"[DB] Error cleaning up panel data: {e}")
 
 
 async def close_pool():
     """Close database connection pool"""
-    global _pool
+    global _pool, _panel_writer_task
+    if _panel_writer_task:
+        _panel_writer_task.cancel()
+        try:
+            await _panel_writer_task
+        except asyncio.CancelledError:
+            pass
+        _panel_writer_task = None
     if _pool:
         await _pool.close()
         _pool = None
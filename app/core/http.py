@@ -0,0 +1,16 @@
+"""Shared HTTP client for the service fetchers"""
+import httpx
+
+# One pooled client for the whole app: connections, TLS sessions and DNS
+# lookups are reused across scheduler ticks instead of rebuilt per call.
+# HTTP/2 lets concurrent fetches to the same host share one connection.
+http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+)
+
+
+async def close_http_client():
+    """Close the shared HTTP client (app shutdown)"""
+    await http_client.aclose()
@@ -1,4 +1,5 @@
 import asyncio
+import math
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from app.config import REFRESH_INTERVALS
@@ -10,8 +11,13 @@ from app.core.cache import cache
 
 scheduler = AsyncIOScheduler()
 
-# SSE clients to notify on updates
-sse_clients: set = set()
+# SSE fan-out: the scheduler stamps each updated panel with a global version
+# and pulses one shared Event; every connected client wakes and reads the
+# panels changed since the last version it saw. Publishing is O(1) no
+# matter how many clients are connected.
+panel_event = asyncio.Event()
+panel_versions: dict[str, int] = {}
+update_version = 0
 
 # Panels to persist to database (skip high-frequency ones like flightradar)
 DB_PERSIST_PANELS = {
@@ -31,61 +37,61 @@ async def persist_to_db(panel: str):
 async def refresh_weather():
     await weather.fetch_weather()
     await persist_to_db("weather")
-    await notify_clients("weather")
+    notify_clients("weather")
 
 
 async def refresh_news():
     await news.fetch_news()
     await persist_to_db("news")
-    await notify_clients("news")
+    notify_clients("news")
 
 
 async def refresh_transit():
     await transit.fetch_transit()
     await persist_to_db("transit")
-    await notify_clients("transit")
+    notify_clients("transit")
 
 
 async def refresh_trains():
     await trains.fetch_trains()
     await persist_to_db("trains")
-    await notify_clients("trains")
+    notify_clients("trains")
 
 
 async def refresh_events():
     await events.fetch_events()
     await persist_to_db("events")
-    await notify_clients("events")
+    notify_clients("events")
 
 
 async def refresh_air_quality():
     await air_quality.fetch_air_quality()
     await persist_to_db("air_quality")
-    await notify_clients("air_quality")
+    notify_clients("air_quality")
 
 
 async def refresh_markets():
     await markets.fetch_markets()
     await persist_to_db("markets")
-    await notify_clients("markets")
+    notify_clients("markets")
 
 
 async def refresh_parking():
     await parking.fetch_parking()
     await persist_to_db("parking")
-    await notify_clients("parking")
+    notify_clients("parking")
 
 
 async def refresh_bikes():
     await bikes.fetch_bikes()
     await persist_to_db("bikes")
-    await notify_clients("bikes")
+    notify_clients("bikes")
 
 
 async def refresh_flights():
     await flights.fetch_flights()
     await persist_to_db("flights")
-    await notify_clients("flights")
+    notify_clients("flights")
 
 
 # Vision is now on-demand only (triggered when user visits the page)
@@ -95,109 +101,102 @@ async def refresh_flights():
 async def refresh_emergency():
     await emergency.fetch_emergency()
     await persist_to_db("emergency")
-    await notify_clients("emergency")
+    notify_clients("emergency")
 
 
 async def refresh_traffic():
     await traffic.fetch_traffic()
     await persist_to_db("traffic")
-    await notify_clients("traffic")
+    notify_clients("traffic")
 
 
 async def refresh_flightradar():
     await flightradar.fetch_flight_positions()
     # Skip DB persist for flightradar - too frequent (15 sec)
-    await notify_clients("flightradar")
-
+    notify_clients("flightradar")
+
+
+def notify_clients(panel: str):
+    """Notify all SSE clients about an update (never blocks on slow clients)."""
+    global update_version
+    update_version += 1
+    panel_versions[panel] = update_version
+    # set() wakes every current waiter; clearing right away re-arms the Event.
+    # Clients that weren't waiting catch up through the version check.
+    panel_event.set()
+    panel_event.clear()
+
+
+def panels_updated_since(version: int) -> tuple[int, list[str]]:
+    """Get the current version and the panels updated after `version`, oldest first."""
+    updated = [panel for panel, v in panel_versions.items() if v > version]
+    updated.sort(key=panel_versions.__getitem__)
+    return update_version, updated
+
+
+# Scheduled refresh per panel; intervals come from REFRESH_INTERVALS
+REFRESH_JOBS = {
+    "weather": refresh_weather,
+    "news": refresh_news,
+    "transit": refresh_transit,
+    "trains": refresh_trains,
+    "events": refresh_events,
+    "air_quality": refresh_air_quality,
+    "markets": refresh_markets,
+    "parking": refresh_parking,
+    "bikes": refresh_bikes,
+    "flights": refresh_flights,
+    # Vision removed from scheduler - now on-demand only to save API costs
+    "emergency": refresh_emergency,
+    "traffic": refresh_traffic,
+    "flightradar": refresh_flightradar,
+}
 
-async def notify_clients(panel: str):
-    """Notify all SSE clients about an update."""
-    for queue in list(sse_clients):
-        try:
-            await queue.put(panel)
-        except Exception:
-            sse_clients.discard(queue)
+# One tick job at the gcd of all intervals runs whatever is due together
+TICK_SECONDS = math.gcd(*(REFRESH_INTERVALS[panel] for panel in REFRESH_JOBS))
+_tick_count = 0
+_running_panels: set = set()
+_refresh_waves: set = set()
+
+
+async def run_refresh_wave(panels: list):
+    """Refresh the given panels concurrently."""
+    _running_panels.update(panels)
+    try:
+        results = await asyncio.gather(
+            *(REFRESH_JOBS[panel]() for panel in panels),
+            return_exceptions=True,
+        )
+        for panel, result in zip(panels, results):
+            if isinstance(result, Exception):
+                print(f"Error refreshing {panel}: {result}")
+    finally:
+        _running_panels.difference_update(panels)
+
+
+async def refresh_tick():
+    """Start a refresh wave for every panel due at this tick."""
+    global _tick_count
+    _tick_count += 1
+    elapsed = _tick_count * TICK_SECONDS
+    due = [
+        panel for panel in REFRESH_JOBS
+        if elapsed % REFRESH_INTERVALS[panel] == 0 and panel not in _running_panels
+    ]
+    if not due:
+        return
+    # Run in the background so a slow scrape (Selenium) can't hold up the next tick
+    wave = asyncio.create_task(run_refresh_wave(due))
+    _refresh_waves.add(wave)
+    wave.add_done_callback(_refresh_waves.discard)
 
 
 def setup_scheduler():
     """Configure and start the scheduler."""
     scheduler.add_job(
-        refresh_weather,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["weather"]),
-        id="weather",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_news,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["news"]),
-        id="news",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_transit,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["transit"]),
-        id="transit",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_trains,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["trains"]),
-        id="trains",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_events,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["events"]),
-        id="events",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_air_quality,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["air_quality"]),
-        id="air_quality",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_markets,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["markets"]),
-        id="markets",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_parking,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["parking"]),
-        id="parking",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_bikes,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["bikes"]),
-        id="bikes",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_flights,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["flights"]),
-        id="flights",
-        replace_existing=True,
-    )
-    # Vision removed from scheduler - now on-demand only to save API costs
-    scheduler.add_job(
-        refresh_emergency,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["emergency"]),
-        id="emergency",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_traffic,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["traffic"]),
-        id="traffic",
-        replace_existing=True,
-    )
-    scheduler.add_job(
-        refresh_flightradar,
-        IntervalTrigger(seconds=REFRESH_INTERVALS["flightradar"]),
-        id="flightradar",
+        refresh_tick,
+        IntervalTrigger(seconds=TICK_SECONDS),
+        id="refresh_tick",
         replace_existing=True,
     )
 
@@ -212,21 +211,38 @@ def setup_scheduler():
     scheduler.start()
 
 
+# Cap concurrent upstream requests during the cold-start fetch
+INITIAL_FETCH_CONCURRENCY = 6
+
+INITIAL_FETCHERS = (
+    weather.fetch_weather,
+    news.fetch_news,
+    transit.fetch_transit,
+    trains.fetch_trains,
+    events.fetch_events,
+    air_quality.fetch_air_quality,
+    markets.fetch_markets,
+    parking.fetch_parking,
+    bikes.fetch_bikes,
+    flights.fetch_flights,
+    emergency.fetch_emergency,
+    traffic.fetch_traffic,
+    flightradar.fetch_flight_positions,
+)
+
+
 async def initial_fetch():
     """Fetch all data on startup."""
-    await asyncio.gather(
-        weather.fetch_weather(),
-        news.fetch_news(),
-        transit.fetch_transit(),
-        trains.fetch_trains(),
-        events.fetch_events(),
-        air_quality.fetch_air_quality(),
-        markets.fetch_markets(),
-        parking.fetch_parking(),
-        bikes.fetch_bikes(),
-        flights.fetch_flights(),
-        emergency.fetch_emergency(),
-        traffic.fetch_traffic(),
-        flightradar.fetch_flight_positions(),
-        return_exceptions=True,
-    )
+    semaphore = asyncio.Semaphore(INITIAL_FETCH_CONCURRENCY)
+
+    async def run(fetch):
+        async with semaphore:
+            try:
+                await fetch()
+            except Exception as e:
+                # One failing source must not cancel the rest of the group
+                print(f"Error in initial fetch {fetch.__module__}.{fetch.__name__}: {e}")
+
+    async with asyncio.TaskGroup() as group:
+        for fetch in INITIAL_FETCHERS:
+            group.create_task(run(fetch))
@@ -5,6 +5,9 @@ from app.api.routes import router as main_router
 from app.api.sse import router as sse_router
 from app.core.scheduler import setup_scheduler, initial_fetch, scheduler
 from app.core.database import init_db, close_pool
+from app.core.http import close_http_client
+from app.services.flightradar import close_fr24_executor
+from app.services.flights import close_scrape_client
 
 
 @asynccontextmanager
@@ -17,6 +20,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     scheduler.shutdown()
     await close_pool()
+    await close_http_client()
+    close_fr24_executor()
+    await close_scrape_client()
 
 
 app = FastAPI(
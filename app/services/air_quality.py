@@ -1,7 +1,8 @@
-import httpx
-from datetime import datetime
-from app.config import AMSTERDAM_LAT, AMSTERDAM_LON, CACHE_TTL, amsterdam_now
+import bisect
+from pydantic import BaseModel
+from app.config import AMSTERDAM_LAT, AMSTERDAM_LON, CACHE_TTL, amsterdam_now_iso_cached
 from app.core.cache import cache
+from app.core.http import http_client
 
 # Open-Meteo Air Quality API (FREE, no key required)
 OPEN_METEO_AQ_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
@@ -15,61 +16,76 @@ AQI_LEVELS = [
     (100, "Very Poor", "purple"),
     (999, "Extremely Poor", "maroon"),
 ]
+_AQI_THRESHOLDS = tuple(threshold for threshold, _, _ in AQI_LEVELS)
+_AQI_DESCRIPTIONS = tuple((level, color) for _, level, color in AQI_LEVELS)
+
+AQ_PARAMS = {
+    "latitude": AMSTERDAM_LAT,
+    "longitude": AMSTERDAM_LON,
+    "current": "european_aqi,pm10,pm2_5,carbon_monoxide,nitrogen_dioxide,sulphur_dioxide,ozone",
+    "timezone": "Europe/Amsterdam",
+}
+
+# (API field, display label) for the pollutant breakdown
+POLLUTANTS = (
+    ("pm2_5", "PM2.5"),
+    ("pm10", "PM10"),
+    ("nitrogen_dioxide", "NO2"),
+    ("sulphur_dioxide", "SO2"),
+    ("carbon_monoxide", "CO"),
+    ("ozone", "O3"),
+)
+
+
+class AQCurrent(BaseModel):
+    """Current readings requested in AQ_PARAMS (other fields are ignored)."""
+    european_aqi: int = 0
+    pm2_5: float | None = None
+    pm10: float | None = None
+    nitrogen_dioxide: float | None = None
+    sulphur_dioxide: float | None = None
+    carbon_monoxide: float | None = None
+    ozone: float | None = None
+
+
+class AQResponse(BaseModel):
+    """The part of the Open-Meteo response we use (parsed and validated in one pass)."""
+    current: AQCurrent = AQCurrent()
 
 
 def get_aqi_level(aqi: int) -> tuple[str, str]:
     """Get European AQI level description and color."""
-    for threshold, level, color in AQI_LEVELS:
-        if aqi <= threshold:
-            return level, color
-    return "Extremely Poor", "maroon"
+    index = bisect.bisect_left(_AQI_THRESHOLDS, aqi)
+    return _AQI_DESCRIPTIONS[min(index, len(_AQI_DESCRIPTIONS) - 1)]
 
 
 async def fetch_air_quality() -> dict:
     """Fetch air quality data from Open-Meteo API (FREE, no key)."""
     try:
-        params = {
-            "latitude": AMSTERDAM_LAT,
-            "longitude": AMSTERDAM_LON,
-            "current": "european_aqi,pm10,pm2_5,carbon_monoxide,nitrogen_dioxide,sulphur_dioxide,ozone",
-            "timezone": "Europe/Amsterdam",
+        response = await http_client.get(OPEN_METEO_AQ_URL, params=AQ_PARAMS, timeout=10.0)
+        response.raise_for_status()
+        current = AQResponse.model_validate_json(response.content).current
+
+        aqi = current.european_aqi
+        level, color = get_aqi_level(aqi)
+
+        pollutants = {
+            label: round(value, 1)
+            for key, label in POLLUTANTS
+            if (value := getattr(current, key)) is not None
+        }
+
+        result = {
+            "aqi": aqi,
+            "level": level,
+            "color": color,
+            "pollutants": pollutants,
+            "station": "Amsterdam (Open-Meteo)",
+            "updated_at": amsterdam_now_iso_cached(),
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(OPEN_METEO_AQ_URL, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-
-            current = data.get("current", {})
-            aqi = current.get("european_aqi", 0)
-            level, color = get_aqi_level(aqi)
-
-            pollutants = {}
-            pollutant_map = {
-                "pm2_5": "PM2.5",
-                "pm10": "PM10",
-                "nitrogen_dioxide": "NO2",
-                "sulphur_dioxide": "SO2",
-                "carbon_monoxide": "CO",
-                "ozone": "O3",
-            }
-
-            for key, label in pollutant_map.items():
-                value = current.get(key)
-                if value is not None:
-                    pollutants[label] = round(value, 1)
-
-            result = {
-                "aqi": aqi,
-                "level": level,
-                "color": color,
-                "pollutants": pollutants,
-                "station": "Amsterdam (Open-Meteo)",
-                "updated_at": amsterdam_now().isoformat(),
-            }
-
-            cache.set("air_quality", result, CACHE_TTL["air_quality"])
-            return result
+        cache.set("air_quality", result, CACHE_TTL["air_quality"])
+        return result
 
     except Exception as e:
         cached = cache.get("air_quality")
@@ -81,13 +97,10 @@ async def fetch_air_quality() -> dict:
             "color": "gray",
             "pollutants": {},
             "error": str(e),
-            "updated_at": datetime.now().isoformat(),
+            "updated_at": amsterdam_now_iso_cached(),
         }
 
 
 async def get_air_quality() -> dict:
     """Get air quality from cache or fetch if needed."""
-    cached = cache.get("air_quality")
-    if cached:
-        return cached
-    return await fetch_air_quality()
+    return await cache.get_or_fetch("air_quality", fetch_air_quality, stale_ttl=CACHE_TTL["air_quality"])
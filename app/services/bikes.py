@@ -1,45 +1,36 @@
-import httpx
-from datetime import datetime
-from app.config import AMSTERDAM_LAT, AMSTERDAM_LON, CACHE_TTL, amsterdam_now
-from app.core.cache import cache
+import bisect
+from itertools import islice, zip_longest
+from typing import Optional
+import orjson
+from app.config import AMSTERDAM_LAT, AMSTERDAM_LON, CACHE_TTL, amsterdam_now_iso_cached
+from app.core.cache import cache, ALWAYS_STALE
+from app.core.http import http_client
 
 # Using weather data to provide cycling conditions
 OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
 
 
-def get_cycling_score(temp: float, wind: float, precip: float, humidity: float) -> tuple[int, str, str]:
-    """Calculate cycling score based on weather conditions."""
-    score = 100
+# Penalty tables: a bisect over the thresholds picks the penalty, so each
+# condition is one lookup instead of an if/elif chain. bisect_right treats a
+# threshold as "below", bisect_left as "above" (matching < and > checks).
+_TEMP_COLD = ((5, 10), (30, 15, 0))         # ideal: 15-22°C
+_TEMP_HOT = ((25, 28), (0, 10, 20))
+_WIND = ((15, 20, 30, 40), (0, 5, 15, 25, 40))  # ideal: < 15 km/h
+_RAIN = ((0, 0.5, 2, 5), (0, 5, 15, 30, 50))
 
-    # Temperature penalty (ideal: 15-22°C)
-    if temp < 5:
-        score -= 30
-    elif temp < 10:
-        score -= 15
-    elif temp > 28:
-        score -= 20
-    elif temp > 25:
-        score -= 10
+_SCORE_THRESHOLDS = (40, 60, 80)
+_SCORE_LEVELS = (("Poor", "red"), ("Fair", "orange"), ("Good", "yellow"), ("Excellent", "green"))
 
-    # Wind penalty (ideal: < 15 km/h)
-    if wind > 40:
-        score -= 40
-    elif wind > 30:
-        score -= 25
-    elif wind > 20:
-        score -= 15
-    elif wind > 15:
-        score -= 5
 
-    # Rain penalty
-    if precip > 5:
-        score -= 50
-    elif precip > 2:
-        score -= 30
-    elif precip > 0.5:
-        score -= 15
-    elif precip > 0:
-        score -= 5
+def get_cycling_score(temp: float, wind: float, precip: float, humidity: float) -> tuple[int, str, str]:
+    """Calculate cycling score based on weather conditions."""
+    score = (
+        100
+        - _TEMP_COLD[1][bisect.bisect_right(_TEMP_COLD[0], temp)]
+        - _TEMP_HOT[1][bisect.bisect_left(_TEMP_HOT[0], temp)]
+        - _WIND[1][bisect.bisect_left(_WIND[0], wind)]
+        - _RAIN[1][bisect.bisect_left(_RAIN[0], precip)]
+    )
 
     # Humidity penalty (high humidity + warm = uncomfortable)
     if humidity > 90:
@@ -48,82 +39,103 @@ def get_cycling_score(temp: float, wind: float, precip: float, humidity: float)
         score -= 5
 
     score = max(0, min(100, score))
+    level, color = _SCORE_LEVELS[bisect.bisect_right(_SCORE_THRESHOLDS, score)]
+    return score, level, color
+
 
+def get_hourly_score(temp: Optional[float], wind: Optional[float],
+                     precip: Optional[float], humidity: Optional[float]) -> Optional[int]:
+    """Cycling score for a forecast hour, or None if any input is missing."""
+    if temp is None or wind is None or precip is None or humidity is None:
+        return None
+    return get_cycling_score(temp, wind, precip, humidity)[0]
+
+
+# Cache TTLs by how fast conditions are likely to change
+BIKES_TTL_VOLATILE = 300   # rain or strong wind
+BIKES_TTL_CALM = 1800      # dry, calm and excellent
+
+
+def get_bikes_ttl(score: int, wind: float, precip: float) -> int:
+    """Pick the cache TTL: short while rain/wind can change fast, long when calm."""
+    if precip > 0 or wind > 25:
+        return BIKES_TTL_VOLATILE
     if score >= 80:
-        return score, "Excellent", "green"
-    elif score >= 60:
-        return score, "Good", "yellow"
-    elif score >= 40:
-        return score, "Fair", "orange"
-    else:
-        return score, "Poor", "red"
+        return BIKES_TTL_CALM
+    return CACHE_TTL.get("bikes", 900)
+
+
+BIKE_PARAMS = {
+    "latitude": AMSTERDAM_LAT,
+    "longitude": AMSTERDAM_LON,
+    "current": "temperature_2m,relative_humidity_2m,precipitation,wind_speed_10m,weather_code",
+    "hourly": "temperature_2m,precipitation_probability,precipitation,relative_humidity_2m,wind_speed_10m",
+    "timezone": "Europe/Amsterdam",
+    "forecast_hours": 12,
+}
 
 
 async def fetch_bikes() -> dict:
     """Fetch cycling conditions for Amsterdam."""
     try:
-        params = {
-            "latitude": AMSTERDAM_LAT,
-            "longitude": AMSTERDAM_LON,
-            "current": "temperature_2m,relative_humidity_2m,precipitation,wind_speed_10m,weather_code",
-            "hourly": "temperature_2m,precipitation_probability,wind_speed_10m",
-            "timezone": "Europe/Amsterdam",
-            "forecast_hours": 12,
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(OPEN_METEO_URL, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-
-            current = data.get("current", {})
-            hourly = data.get("hourly", {})
-
-            temp = current.get("temperature_2m", 15)
-            humidity = current.get("relative_humidity_2m", 50)
-            precip = current.get("precipitation", 0)
-            wind = current.get("wind_speed_10m", 10)
-
-            score, condition, color = get_cycling_score(temp, wind, precip, humidity)
-
-            # Build hourly forecast
-            forecast = []
-            times = hourly.get("time", [])
-            temps = hourly.get("temperature_2m", [])
-            winds = hourly.get("wind_speed_10m", [])
-            rain_probs = hourly.get("precipitation_probability", [])
-
-            for i in range(min(6, len(times))):
-                hour = times[i][11:16] if len(times[i]) > 11 else times[i]
-                forecast.append({
-                    "time": hour,
-                    "temp": temps[i] if i < len(temps) else None,
-                    "wind": winds[i] if i < len(winds) else None,
-                    "rain_prob": rain_probs[i] if i < len(rain_probs) else None,
-                })
-
-            result = {
-                "score": score,
-                "condition": condition,
-                "color": color,
-                "current": {
-                    "temperature": temp,
-                    "humidity": humidity,
-                    "precipitation": precip,
-                    "wind_speed": wind,
-                },
-                "forecast": forecast,
-                "tip": get_cycling_tip(score, temp, wind, precip),
-                "updated_at": amsterdam_now().isoformat(),
+        response = await http_client.get(OPEN_METEO_URL, params=BIKE_PARAMS, timeout=10.0)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        current = data.get("current", {})
+        hourly = data.get("hourly", {})
+
+        temp = current.get("temperature_2m", 15)
+        humidity = current.get("relative_humidity_2m", 50)
+        precip = current.get("precipitation", 0)
+        wind = current.get("wind_speed_10m", 10)
+
+        score, condition, color = get_cycling_score(temp, wind, precip, humidity)
+
+        # Build hourly forecast
+        times = hourly.get("time", [])
+        temps = hourly.get("temperature_2m", [])
+        winds = hourly.get("wind_speed_10m", [])
+        rain_probs = hourly.get("precipitation_probability", [])
+        precips = hourly.get("precipitation", [])
+        humidities = hourly.get("relative_humidity_2m", [])
+
+        # Next 6 hours; missing values in shorter series become None
+        forecast = [
+            {
+                "time": hour[11:16] if len(hour) > 11 else hour,
+                "temp": hour_temp,
+                "wind": hour_wind,
+                "rain_prob": rain_prob,
+                "score": get_hourly_score(hour_temp, hour_wind, hour_precip, hour_humidity),
             }
+            for hour, hour_temp, hour_wind, rain_prob, hour_precip, hour_humidity in islice(
+                zip_longest(times, temps, winds, rain_probs, precips, humidities), min(6, len(times))
+            )
+        ]
+
+        result = {
+            "score": score,
+            "condition": condition,
+            "color": color,
+            "current": {
+                "temperature": temp,
+                "humidity": humidity,
+                "precipitation": precip,
+                "wind_speed": wind,
+            },
+            "forecast": forecast,
+            "tip": get_cycling_tip(score, temp, wind, precip),
+            "updated_at": amsterdam_now_iso_cached(),
+        }
 
-            cache.set("bikes", result, CACHE_TTL.get("bikes", 900))
-            return result
+        cache.set("bikes", result, get_bikes_ttl(score, wind, precip))
+        return result
 
     except Exception as e:
-        cached = cache.get("bikes")
-        if cached:
-            return cached
+        # No cache fallback here: get_or_fetch only calls this once the cached
+        # value has expired (and keeps serving it stale), and the scheduler
+        # ignores the result, so a failed fetch just leaves the cache alone
         return {
             "score": None,
             "condition": "Error",
@@ -132,7 +144,7 @@ async def fetch_bikes() -> dict:
             "forecast": [],
             "tip": "",
             "error": str(e),
-            "updated_at": datetime.now().isoformat(),
+            "updated_at": amsterdam_now_iso_cached(),
         }
 
 
@@ -160,7 +172,4 @@ def get_cycling_tip(score: int, temp: float, wind: float, precip: float) -> str:
 
 async def get_bikes() -> dict:
     """Get cycling conditions from cache or fetch if needed."""
-    cached = cache.get("bikes")
-    if cached:
-        return cached
-    return await fetch_bikes()
+    return await cache.get_or_fetch("bikes", fetch_bikes, stale_ttl=ALWAYS_STALE)
@@ -1,4 +1,6 @@
 """Amsterdam Live Cameras Service - Real webcam feeds"""
+import orjson
+from functools import lru_cache
 from typing import List, Dict
 
 # Real Amsterdam webcam feeds
@@ -42,37 +44,50 @@ WEBCAM_IMAGES = [
     },
 ]
 
-async def get_cameras_data(panel_index: int = 0) -> Dict:
-    """Get available camera feeds for a specific panel
-    
-    Args:
-        panel_index: 0 for first panel, 1 for second panel
-    """
-    cameras = []
+# Camera list as served to the panels; it never changes, so build it once
+_CAMERAS_PAYLOAD = [
+    {
+        "id": cam["id"],
+        "name": cam["name"],
+        "location": cam["location"],
+        "type": cam.get("type", "youtube"),
+        "embed": cam.get("embed"),
+        "image": cam.get("url"),
+        "video_id": cam.get("video_id"),
+        "refresh": cam.get("refresh", 0)
+    }
+    for cam in AMSTERDAM_CAMERAS
+]
 
-    for cam in AMSTERDAM_CAMERAS:
-        cameras.append({
-            "id": cam["id"],
-            "name": cam["name"],
-            "location": cam["location"],
-            "type": cam.get("type", "youtube"),
-            "embed": cam.get("embed"),
-            "image": cam.get("url"),
-            "video_id": cam.get("video_id"),
-            "refresh": cam.get("refresh", 0)
-        })
 
-    # For second panel, start at a different camera index
-    start_index = panel_index if panel_index < len(cameras) else 0
+@lru_cache(maxsize=4)
+def _cameras_data(panel_index: int = 0) -> Dict:
+    """Build the camera panel payload; depends only on panel_index, so it is memoized.
 
+    The returned dict is shared between callers and must not be modified.
+    """
     return {
-        "cameras": cameras,
-        "current_index": start_index,
+        "cameras": _CAMERAS_PAYLOAD,
+        # For second panel, start at a different camera index
+        "current_index": panel_index if panel_index < len(_CAMERAS_PAYLOAD) else 0,
         "auto_rotate": True,
         "rotate_interval": 30,  # seconds (longer for video streams)
         "panel_id": f"panel-cameras{panel_index + 1 if panel_index > 0 else ''}"
     }
 
+
+# /api/cameras response body, serialized once at import
+CAMERAS_JSON = orjson.dumps(_cameras_data())
+
+
+async def get_cameras_data(panel_index: int = 0) -> Dict:
+    """Get available camera feeds for a specific panel
+    
+    Args:
+        panel_index: 0 for first panel, 1 for second panel
+    """
+    return _cameras_data(panel_index)
+
 def get_camera_list() -> List[Dict]:
     """Get list of all cameras"""
     return AMSTERDAM_CAMERAS
@@ -0,0 +1,40 @@
+"""Dashboard Service - Loads all panels for the main page concurrently"""
+import asyncio
+from typing import Any, Dict
+from app.core.cache import cache
+from app.services import weather, news, transit, events, air_quality, markets
+from app.services import parking, trains, bikes
+
+# Panels rendered server-side in index.html, in template order
+DASHBOARD_PANELS = (
+    ("weather", weather.get_weather),
+    ("news", news.get_news),
+    ("transit", transit.get_transit),
+    ("trains", trains.get_trains),
+    ("events", events.get_events),
+    ("air_quality", air_quality.get_air_quality),
+    ("markets", markets.get_markets),
+    ("parking", parking.get_parking),
+    ("bikes", bikes.get_bikes),
+)
+DASHBOARD_PANEL_NAMES = tuple(name for name, _ in DASHBOARD_PANELS)
+
+
+async def fetch_all_panels() -> Dict[str, Any]:
+    """Get data for every dashboard panel in parallel.
+
+    A panel that raises falls back to its last cached value (or an empty dict)
+    so one failing source can't take down the whole page.
+    """
+    results = await asyncio.gather(
+        *(getter() for _, getter in DASHBOARD_PANELS),
+        return_exceptions=True,
+    )
+
+    data = {}
+    for name, result in zip(DASHBOARD_PANEL_NAMES, results):
+        if isinstance(result, Exception):
+            print(f"Error loading {name} panel: {result}")
+            result = cache.get(name) or {}
+        data[name] = result
+    return data
@@ -1,12 +1,19 @@
 """P2000 Emergency Scanner Service - Scrapes Dutch emergency services feed"""
 import httpx
 import asyncio
-from datetime import datetime
-from zoneinfo import ZoneInfo
+import io
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from itertools import islice
 import re
-from typing import Optional, Tuple
-from app.config import amsterdam_now, AMSTERDAM_TZ, CACHE_TTL
-from app.core.cache import cache
+from typing import Callable, List, Optional, Tuple
+from app.config import amsterdam_now, AMSTERDAM_TZ, CACHE_TTL, amsterdam_now_hms_cached
+from app.core.cache import cache, ALWAYS_STALE, TTLCache
+from app.core.database import get_cached_geocode, save_geocode
+from app.core.http import http_client
 
 # P2000 data sources
 # Use the Python script endpoint that returns HTML table
@@ -18,25 +25,157 @@ P2000_RSS_FEEDS = [
     # "https://alarmeringen.nl/webfeeds/rss.php?regio=noord-holland",
 ]
 
+P2000_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Validators and parsed incidents from each source's last 200 response:
+# {url: {"etag": str, "last_mod": str, "parsed": list}}
+_feed_meta: dict[str, dict] = {}
+
 # Amsterdam region codes
 AMSTERDAM_REGIONS = ["Amsterdam", "Amstelland", "Zaanstreek", "Noord-Holland"]
+# Nearby places whose incidents are also shown
+NEARBY_KEYWORDS = ["haarlem", "zaandam", "amstelveen", "haarlemmermeer", "diemen", "weesp"]
+
+# Regex RSS item parsing, for feeds the XML parser rejects
+# (bytes patterns: feeds are scanned undecoded, only matched fields are decoded)
+_RSS_ITEM_RE = re.compile(rb'<item>(.*?)</item>', re.DOTALL)
+_RSS_TITLE_RE = re.compile(rb'<title>(.*?)</title>')
+_RSS_DESC_RE = re.compile(rb'<description>(.*?)</description>')
+_RSS_DATE_RE = re.compile(rb'<pubDate>(.*?)</pubDate>')
+# P2000 HTML table row: date/time, type class (Po|Am|Br), type, region, message
+_HTML_ROW_RE = re.compile(
+    r'<tr><td class="DT">(?P<dt>[^<]+)</td><td class="(?P<cls>Po|Am|Br)">[^<]+</td>'
+    r'<td class="Regio">(?P<region>[^<]+)</td><td class="Md">(?P<msg>[^<]+)</td></tr>',
+    re.IGNORECASE,
+)
+# Row type class -> incident type
+_HTML_TYPE_MAP = {'br': 'fire', 'am': 'ambulance', 'po': 'police'}
+_TIME_RE = re.compile(r'(\d{1,2}):(\d{2}):(\d{2})')
+_CDATA_RE = re.compile(r'<!\[CDATA\[(.*?)\]\]>')
+_TAG_RE = re.compile(r'<[^>]+>')
+# Street name and Dutch postcode (4 digits + 2 letters, optional space),
+# found in one scan. The two can't overlap: streets are letters only and
+# postcodes start with a digit, so the first match of each is the same as
+# searching for them separately.
+_STREET_SUFFIXES = r'(?:straat|weg|laan|plein|kade|gracht|dijk|singel|park|hof|plantsoen|brug)'
+_LOCATION_RE = re.compile(
+    rf'(?P<street>[A-Z][a-z]+{_STREET_SUFFIXES})|\b(?P<postcode>\d{{4}}\s?[A-Z]{{2}})\b',
+    re.IGNORECASE,
+)
+# Locations specific enough to geocode (street-level names)
+_GEOCODABLE_RE = re.compile(r'straat|weg|laan|plein|kade|gracht', re.IGNORECASE)
+# Known Amsterdam areas/districts, as (name, lowercase name)
+_AMSTERDAM_AREAS = tuple((area, area.lower()) for area in (
+    "Centrum", "Jordaan", "De Pijp", "Oud-West", "Oud-Zuid", "Nieuw-West",
+    "Noord", "Oost", "Zuidoost", "West", "Zuid", "Amstelveen", "Diemen"
+))
+
+# Incident keywords for every type, found in one case-insensitive scan.
+# The lookahead matches at each position without consuming text, so
+# overlapping keywords of different types are all reported.
+_INCIDENT_KEYWORD_RE = re.compile(
+    r'(?=(?P<fire>brand|fire|rook|smoke)'
+    r'|(?P<ambulance>ambulance|letsel|medisch|reanimatie)'
+    r'|(?P<police>politie|police|overval|inbraak))',
+    re.IGNORECASE,
+)
+
+# One case-insensitive scan for any Amsterdam region or nearby place
+_AREA_RE = re.compile(
+    "|".join(re.escape(name) for name in (*AMSTERDAM_REGIONS, *NEARBY_KEYWORDS)),
+    re.IGNORECASE,
+)
+
+# Fire/ambulance incidents in one fetch that count as a busy period
+BUSY_INCIDENT_COUNT = 10
 
 # Geocoding cache to avoid repeated API calls
-_geocoding_cache = {}
+# (bounded and expiring, so new street names can't grow it forever)
+GEOCODE_CACHE_SIZE = 2048
+GEOCODE_TTL = 86400  # re-geocode daily
+_geocoding_cache = TTLCache(maxsize=GEOCODE_CACHE_SIZE)
+# Concurrent Nominatim requests (keeps us polite without serializing lookups)
+GEOCODE_CONCURRENCY = 5
+_geocode_semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+
+
+@dataclass(slots=True)
+class Incident:
+    """One P2000 call; lat/lng are filled in for geocoded incidents.
+
+    Slots keep the up to 50 cached incidents compact; orjson serializes
+    dataclasses natively and Jinja reads the attributes like dict keys.
+    """
+    type: str
+    text: str
+    location: str
+    postcode: Optional[str]
+    time: str
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+
+
+def get_emergency_ttl(incidents: List[Incident]) -> int:
+    """Cache TTL: halved while many fire/ambulance calls are coming in."""
+    ttl = CACHE_TTL.get("emergency", 90)
+    active = sum(1 for incident in incidents if incident.type in ("fire", "ambulance"))
+    return ttl // 2 if active >= BUSY_INCIDENT_COUNT else ttl
+
 
 async def fetch_emergency() -> dict:
     """Fetch P2000 emergency data and cache it - called by scheduler"""
     data = await _fetch_emergency_data()
-    cache.set("emergency", data, CACHE_TTL.get("emergency", 90))
+    cache.set("emergency", data, get_emergency_ttl(data["incidents"]))
     return data
 
 
 async def get_emergency_data() -> dict:
     """Get cached emergency data or fetch if not available"""
-    cached = cache.get("emergency")
-    if cached:
-        return cached
-    return await fetch_emergency()
+    return await cache.get_or_fetch("emergency", fetch_emergency, stale_ttl=ALWAYS_STALE)
+
+
+async def _fetch_feed(url: str, parse: Callable[[httpx.Response], list], headers: Optional[dict] = None) -> list:
+    """Conditional GET of a P2000 source; a 304 reuses the incidents parsed last time."""
+    headers = dict(headers or {})
+    meta = _feed_meta.get(url)
+    if meta:
+        if meta["etag"]:
+            headers["If-None-Match"] = meta["etag"]
+        if meta["last_mod"]:
+            headers["If-Modified-Since"] = meta["last_mod"]
+
+    response = await http_client.get(url, headers=headers)
+    if response.status_code == 304 and meta:
+        return meta["parsed"]
+    if response.status_code != 200:
+        return []
+
+    parsed = parse(response)
+    etag = response.headers.get("etag")
+    last_mod = response.headers.get("last-modified")
+    if parsed and (etag or last_mod):
+        _feed_meta[url] = {"etag": etag, "last_mod": last_mod, "parsed": parsed}
+    else:
+        _feed_meta.pop(url, None)
+    return parsed
+
+
+def _parse_html_response(response: httpx.Response) -> list:
+    """Parse the P2000 HTML table page."""
+    return parse_p2000_html(response.text)
+
+
+def _parse_rss_response(response: httpx.Response) -> list:
+    """Parse an RSS response, ignoring HTML error pages."""
+    # Check if response is actually RSS/XML (not HTML error page)
+    # (on the raw bytes, so the feed is never decoded as a whole)
+    content_type = response.headers.get('content-type', '').lower()
+    content = response.content
+    if 'xml' in content_type or content.strip().startswith(b'<?xml') or b'<rss' in content.lower() or b'<feed' in content.lower():
+        return parse_p2000_feed(content)
+    return []
 
 
 async def _fetch_emergency_data() -> dict:
@@ -45,38 +184,27 @@ async def _fetch_emergency_data() -> dict:
     is_live_data = False
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # First try HTML scraping (main source)
-            try:
-                response = await client.get(P2000_URL, headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                })
-                if response.status_code == 200:
-                    parsed_incidents = parse_p2000_html(response.text)
+        # First try HTML scraping (main source)
+        try:
+            parsed_incidents = await _fetch_feed(P2000_URL, _parse_html_response, headers=P2000_HEADERS)
+            if parsed_incidents:
+                incidents = parsed_incidents
+                is_live_data = True
+        except Exception as e:
+            print(f"Error fetching P2000 HTML {P2000_URL}: {e}")
+        
+        # If HTML didn't work, try RSS feeds as fallback
+        if not incidents:
+            for feed_url in P2000_RSS_FEEDS:
+                try:
+                    parsed_incidents = await _fetch_feed(feed_url, _parse_rss_response)
                     if parsed_incidents:
                         incidents = parsed_incidents
                         is_live_data = True
-            except Exception as e:
-                print(f"Error fetching P2000 HTML {P2000_URL}: {e}")
-            
-            # If HTML didn't work, try RSS feeds as fallback
-            if not incidents:
-                for feed_url in P2000_RSS_FEEDS:
-                    try:
-                        response = await client.get(feed_url)
-                        if response.status_code == 200:
-                            # Check if response is actually RSS/XML (not HTML error page)
-                            content_type = response.headers.get('content-type', '').lower()
-                            if 'xml' in content_type or response.text.strip().startswith('<?xml') or '<rss' in response.text.lower() or '<feed' in response.text.lower():
-                                # Parse the XML/RSS feed
-                                parsed_incidents = parse_p2000_feed(response.text)
-                                if parsed_incidents:
-                                    incidents = parsed_incidents
-                                    is_live_data = True
-                                    break
-                    except Exception as e:
-                        print(f"Error fetching RSS feed {feed_url}: {e}")
-                        continue
+                        break
+                except Exception as e:
+                    print(f"Error fetching RSS feed {feed_url}: {e}")
+                    continue
 
     except Exception as e:
         print(f"Error fetching P2000 data: {e}")
@@ -88,25 +216,21 @@ async def _fetch_emergency_data() -> dict:
     incidents_to_geocode = incidents[:10]  # Only geocode top 10
     
     for incident in incidents_to_geocode:
-        location = incident.get("location", "")
+        location = incident.location
         # Only geocode if it's a specific street/address, not generic locations
-        if location and location != "Amsterdam" and any(word in location.lower() for word in ["straat", "weg", "laan", "plein", "kade", "gracht"]):
+        if location and location != "Amsterdam" and _GEOCODABLE_RE.search(location):
             geocoding_tasks.append((incident, geocode_address(location)))
     
-    # Run geocoding in parallel (but limit concurrent requests)
+    # Run geocoding in parallel; geocode_address caps concurrent requests
     if geocoding_tasks:
-        # Process in batches of 3 to respect rate limits
-        for i in range(0, len(geocoding_tasks), 3):
-            batch = geocoding_tasks[i:i+3]
-            results = await asyncio.gather(*[task[1] for task in batch], return_exceptions=True)
-            for (incident, _), coords in zip(batch, results):
-                if coords and not isinstance(coords, Exception):
-                    incident["lat"] = coords[0]
-                    incident["lng"] = coords[1]
+        results = await asyncio.gather(*[task[1] for task in geocoding_tasks], return_exceptions=True)
+        for (incident, _), coords in zip(geocoding_tasks, results):
+            if coords and not isinstance(coords, Exception):
+                incident.lat, incident.lng = coords
     
     return {
         "incidents": incidents[:25],  # Return all incidents, but only top 10 have coords
-        "updated": amsterdam_now().strftime("%H:%M:%S"),
+        "updated": amsterdam_now_hms_cached(),
         "status": "live" if is_live_data else "simulated"
     }
 
@@ -117,150 +241,154 @@ def parse_p2000_html(html_content: str) -> list:
     if not html_content or '<table' not in html_content.lower():
         return incidents
     
-    # Find all table rows with incident data
-    # Pattern: <tr><td class="DT">date time</td><td class="Po|Am|Br">type</td><td class="Regio">region</td><td class="Md">message</td></tr>
-    row_pattern = r'<tr><td class="DT">([^<]+)</td><td class="(Po|Am|Br)">([^<]+)</td><td class="Regio">([^<]+)</td><td class="Md">([^<]+)</td></tr>'
-    matches = re.findall(row_pattern, html_content, re.IGNORECASE)
+    # Scan table rows lazily and stop after 50 incidents, instead of
+    # matching (and materializing) every row on the page first
+    matches = islice(_HTML_ROW_RE.finditer(html_content), 50)
     
-    for match in matches[:50]:  # Limit to 50 incidents
-        date_time_str, type_class, type_name, region, message = match
-        
+    # Fallback time for rows without one, formatted once per page
+    now = amsterdam_now()
+    now_str = f"{now.hour:02d}:{now.minute:02d}"
+
+    for match in matches:
+        message = match['msg']
+        region = match['region']
+
         # Parse date/time
         # Format: "13-01-2026 17:19:17"
-        time_str = amsterdam_now().strftime("%H:%M")
-        try:
-            dt_match = re.search(r'(\d{1,2}):(\d{2}):(\d{2})', date_time_str)
-            if dt_match:
-                time_str = f"{dt_match.group(1)}:{dt_match.group(2)}"
-        except:
-            pass
+        dt_match = _TIME_RE.search(match['dt'])
+        time_str = f"{dt_match.group(1)}:{dt_match.group(2)}" if dt_match else now_str
         
-        # Determine incident type from class
-        if type_class.lower() == 'br':
-            incident_type = 'fire'
-        elif type_class.lower() == 'am':
-            incident_type = 'ambulance'
-        elif type_class.lower() == 'po':
-            incident_type = 'police'
-        else:
-            incident_type = classify_incident(message)
+        # The pattern only matches the three known classes
+        incident_type = _HTML_TYPE_MAP[match['cls'].lower()]
         
         # Extract location and postcode from message
-        location = extract_location(message) or region or "Amsterdam"
-        postcode = extract_postcode(message)
+        location, postcode = extract_location_and_postcode(message)
+        location = location or region or "Amsterdam"
         
-        incident = {
-            "type": incident_type,
-            "text": clean_text(message),
-            "location": location,
-            "postcode": postcode,
-            "time": time_str
-        }
-        
-        incidents.append(incident)
+        incidents.append(Incident(
+            type=incident_type,
+            text=clean_text(message),
+            location=location,
+            postcode=postcode,
+            time=time_str,
+        ))
     
     return incidents
 
-def parse_p2000_feed(xml_content: str) -> list:
-    """Parse P2000 RSS/XML feed"""
+def _rss_items(xml_content: bytes) -> List[Tuple[str, str, Optional[str]]]:
+    """(title, description, pubDate) for the first 50 RSS items that have a title.
+
+    Streams the feed through the C XML parser, which also resolves CDATA and
+    entities; malformed feeds fall back to regex scraping.
+    """
+    items = []
+    try:
+        seen = 0
+        for _, elem in ET.iterparse(io.BytesIO(xml_content), events=("end",)):
+            if elem.tag != "item":
+                continue
+            title = elem.findtext("title")
+            if title is not None:
+                items.append((title.strip(), (elem.findtext("description") or "").strip(), elem.findtext("pubDate")))
+            elem.clear()
+            seen += 1
+            if seen == 50:
+                break
+        return items
+    except ET.ParseError:
+        pass
+
+    items = []
+    for item in _RSS_ITEM_RE.findall(xml_content)[:50]:
+        title_match = _RSS_TITLE_RE.search(item)
+        if not title_match:
+            continue
+        desc_match = _RSS_DESC_RE.search(item)
+        date_match = _RSS_DATE_RE.search(item)
+        items.append((
+            title_match.group(1).strip().decode("utf-8", "replace"),
+            desc_match.group(1).strip().decode("utf-8", "replace") if desc_match else "",
+            date_match.group(1).decode("utf-8", "replace") if date_match else None,
+        ))
+    return items
+
+
+def parse_p2000_feed(xml_content: bytes) -> list:
+    """Parse P2000 RSS/XML feed (raw response bytes)"""
     incidents = []
     
     # Check if content is actually XML/RSS (not HTML error page)
-    if not xml_content or '<html' in xml_content.lower() or '404' in xml_content or 'not found' in xml_content.lower():
+    if not xml_content or b'<html' in xml_content.lower() or b'404' in xml_content or b'not found' in xml_content.lower():
         return incidents
 
-    # Simple regex parsing for RSS items
-    items = re.findall(r'<item>(.*?)</item>', xml_content, re.DOTALL)
-
-    for item in items[:50]:  # Parse more items from feed
-        title_match = re.search(r'<title>(.*?)</title>', item)
-        desc_match = re.search(r'<description>(.*?)</description>', item)
-        date_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
-
-        if title_match:
-            title = title_match.group(1).strip()
-            desc = desc_match.group(1).strip() if desc_match else ""
-
-            # Filter for Amsterdam region (but be more lenient)
-            is_amsterdam = any(region.lower() in (title + desc).lower()
-                             for region in AMSTERDAM_REGIONS)
-            
-            # Also include nearby regions and major incidents
-            nearby_keywords = ["haarlem", "zaandam", "amstelveen", "haarlemmermeer", "diemen", "weesp"]
-            is_nearby = any(keyword in (title + desc).lower() for keyword in nearby_keywords)
-            
-            # Include if Amsterdam region, nearby, or if we need more incidents
-            if is_amsterdam or is_nearby or len(incidents) < 15:
-                incident_type = classify_incident(title)
-                location = extract_location(title + " " + desc) or "Amsterdam"
-                postcode = extract_postcode(title + " " + desc)
-                incident = {
-                    "type": incident_type,
-                    "text": clean_text(title),
-                    "location": location,
-                    "postcode": postcode,
-                    "time": parse_time(date_match.group(1) if date_match else None)
-                }
-                incidents.append(incident)
+    for title, desc, pub_date in _rss_items(xml_content):
+        # Include if Amsterdam region, nearby, or if we need more incidents
+        if len(incidents) < 15 or _AREA_RE.search(title) or _AREA_RE.search(desc):
+            location, postcode = extract_location_and_postcode(title + " " + desc)
+            incidents.append(Incident(
+                type=classify_incident(title),
+                text=clean_text(title),
+                location=location or "Amsterdam",
+                postcode=postcode,
+                time=parse_time(pub_date),
+            ))
 
     return incidents
 
 def classify_incident(text: str) -> str:
-    """Classify incident type based on keywords"""
-    text_lower = text.lower()
-
-    if any(word in text_lower for word in ['brand', 'fire', 'rook', 'smoke']):
-        return 'fire'
-    elif any(word in text_lower for word in ['ambulance', 'letsel', 'medisch', 'reanimatie']):
-        return 'ambulance'
-    elif any(word in text_lower for word in ['politie', 'police', 'overval', 'inbraak']):
+    """Classify incident type based on keywords (fire > ambulance > police)"""
+    found = set()
+    for match in _INCIDENT_KEYWORD_RE.finditer(text):
+        if match.lastgroup == 'fire':
+            return 'fire'
+        found.add(match.lastgroup)
+    if 'police' in found and 'ambulance' not in found:
         return 'police'
-    else:
-        return 'ambulance'  # Default
+    return 'ambulance'  # Also the default
 
 def clean_text(text: str) -> str:
     """Clean and truncate text"""
-    # Remove CDATA, HTML tags, etc
-    text = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', text)
-    text = re.sub(r'<[^>]+>', '', text)
+    # Remove CDATA, HTML tags, etc. Text from the XML parser already has
+    # CDATA unwrapped and usually no markup, so skip both passes then
+    if '<' in text:
+        text = _CDATA_RE.sub(r'\1', text)
+        text = _TAG_RE.sub('', text)
     text = text.strip()
     return text[:80] + "..." if len(text) > 80 else text
 
+def extract_location_and_postcode(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract (location, postcode) from text in a single regex pass.
+
+    Location is the first street name, else a known Amsterdam area; the
+    postcode is normalized to 1234AB.
+    """
+    street = postcode = None
+    for match in _LOCATION_RE.finditer(text):
+        if match.lastgroup == "street":
+            street = street or match.group("street")
+        elif postcode is None:
+            postcode = match.group("postcode").replace(' ', '').upper()
+        if street and postcode:
+            break
+
+    if street:
+        return street.strip(), postcode
+
+    # Also check for known Amsterdam areas/districts
+    text_lower = text.lower()
+    for area, area_lower in _AMSTERDAM_AREAS:
+        if area_lower in text_lower:
+            return area, postcode
+
+    return None, postcode
+
 def extract_postcode(text: str) -> Optional[str]:
     """Extract Dutch postcode from text (format: 1234AB or 1234 AB)"""
-    # Dutch postcode pattern: 4 digits + 2 letters (optional space)
-    postcode_pattern = r'\b(\d{4}\s?[A-Z]{2})\b'
-    match = re.search(postcode_pattern, text, re.IGNORECASE)
-    if match:
-        # Normalize: remove space, uppercase letters
-        postcode = match.group(1).replace(' ', '').upper()
-        return postcode
-    return None
+    return extract_location_and_postcode(text)[1]
 
 def extract_location(text: str) -> Optional[str]:
     """Try to extract location from text"""
-    # Look for street patterns (more comprehensive)
-    patterns = [
-        r'([A-Z][a-z]+(?:straat|weg|laan|plein|kade|gracht|dijk|singel|park|hof|plantsoen|brug))',
-        r'([A-Z][a-z]+(?:straat|weg|laan|plein|kade|gracht|dijk|singel|park|hof|plantsoen|brug)\s+\d+)',
-        r'(\d+\s+[A-Z][a-z]+(?:straat|weg|laan|plein|kade|gracht|dijk|singel|park|hof|plantsoen|brug))',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-    
-    # Also check for known Amsterdam areas/districts
-    amsterdam_areas = [
-        "Centrum", "Jordaan", "De Pijp", "Oud-West", "Oud-Zuid", "Nieuw-West",
-        "Noord", "Oost", "Zuidoost", "West", "Zuid", "Amstelveen", "Diemen"
-    ]
-    for area in amsterdam_areas:
-        if area.lower() in text.lower():
-            return area
-    
-    return None
+    return extract_location_and_postcode(text)[0]
 
 async def geocode_address(address: str) -> Optional[Tuple[float, float]]:
     """Geocode an address to lat/lng using OpenStreetMap Nominatim"""
@@ -268,16 +396,23 @@ async def geocode_address(address: str) -> Optional[Tuple[float, float]]:
         return None
     
     # Check cache first
-    if address in _geocoding_cache:
-        return _geocoding_cache[address]
+    coords = _geocoding_cache.get(address)
+    if coords is not None:
+        return coords
+
+    # Then the database, which keeps results across restarts
+    coords = await get_cached_geocode(address, GEOCODE_TTL)
+    if coords is not None:
+        _geocoding_cache.set(address, coords, GEOCODE_TTL)
+        return coords
     
     try:
         # Add Amsterdam context for better results
         query = f"{address}, Amsterdam, Netherlands"
         
         # Use shorter timeout for faster failure
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            response = await client.get(
+        async with _geocode_semaphore:
+            response = await http_client.get(
                 "https://nominatim.openstreetmap.org/search",
                 params={
                     "q": query,
@@ -288,17 +423,19 @@ async def geocode_address(address: str) -> Optional[Tuple[float, float]]:
                 headers={
                     "User-Agent": "AmsterdamMonitor/1.0"  # Required by Nominatim
                 },
-                follow_redirects=True
+                follow_redirects=True,
+                timeout=3.0
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    lat = float(data[0]["lat"])
-                    lng = float(data[0]["lon"])
-                    # Cache the result
-                    _geocoding_cache[address] = (lat, lng)
-                    return (lat, lng)
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data and len(data) > 0:
+                lat = float(data[0]["lat"])
+                lng = float(data[0]["lon"])
+                # Cache the result
+                _geocoding_cache.set(address, (lat, lng), GEOCODE_TTL)
+                await save_geocode(address, lat, lng)
+                return (lat, lng)
     except (httpx.TimeoutException, httpx.RequestError) as e:
         # Don't log timeout errors, just return None
         pass
@@ -309,39 +446,26 @@ async def geocode_address(address: str) -> Optional[Tuple[float, float]]:
 
 def parse_time(date_str: Optional[str]) -> str:
     """Parse date string to time and convert to Amsterdam timezone"""
-    if not date_str:
-        return amsterdam_now().strftime("%H:%M")
+    hhmm = _feed_time(date_str.strip()) if date_str else None
+    return hhmm or amsterdam_now().strftime("%H:%M")
 
-    try:
-        # Try common RSS date formats (usually UTC)
-        for fmt in ["%a, %d %b %Y %H:%M:%S %z", "%a, %d %b %Y %H:%M:%S +0000", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%SZ"]:
-            try:
-                dt_str = date_str.strip()
-                # Handle UTC timezone
-                if dt_str.endswith(" +0000") or dt_str.endswith(" GMT"):
-                    dt_str = dt_str.replace(" +0000", "").replace(" GMT", "")
-                    dt = datetime.strptime(dt_str, "%a, %d %b %Y %H:%M:%S")
-                    utc_dt = dt.replace(tzinfo=ZoneInfo("UTC"))
-                    ams_dt = utc_dt.astimezone(AMSTERDAM_TZ)
-                    return ams_dt.strftime("%H:%M")
-                elif "Z" in dt_str or "+00:00" in dt_str:
-                    dt_str = dt_str.replace("Z", "+00:00")
-                    dt = datetime.fromisoformat(dt_str)
-                    ams_dt = dt.astimezone(AMSTERDAM_TZ)
-                    return ams_dt.strftime("%H:%M")
-                else:
-                    dt = datetime.strptime(dt_str, fmt)
-                    if dt.tzinfo:
-                        ams_dt = dt.astimezone(AMSTERDAM_TZ)
-                        return ams_dt.strftime("%H:%M")
-                    else:
-                        # Assume UTC if no timezone
-                        utc_dt = dt.replace(tzinfo=ZoneInfo("UTC"))
-                        ams_dt = utc_dt.astimezone(AMSTERDAM_TZ)
-                        return ams_dt.strftime("%H:%M")
-            except ValueError:
-                continue
-    except Exception:
-        pass
 
-    return amsterdam_now().strftime("%H:%M")
+@lru_cache(maxsize=1024)
+def _feed_time(date_str: str) -> Optional[str]:
+    """Amsterdam HH:MM for an RSS (RFC 2822) or ISO 8601 date, None if unparseable.
+
+    Feeds repeat the same pubDates poll after poll, so results are memoized;
+    the string's shape picks the parser instead of trying formats in turn.
+    """
+    try:
+        if "," in date_str:
+            # RFC 2822: "Mon, 13 Jan 2026 16:19:17 +0000" (or GMT)
+            dt = parsedate_to_datetime(date_str)
+        else:
+            dt = datetime.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        # Assume UTC if no timezone
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(AMSTERDAM_TZ).strftime("%H:%M")
@@ -1,71 +1,97 @@
-import httpx
-from datetime import datetime, timedelta
-from app.config import TICKETMASTER_URL, TICKETMASTER_API_KEY, CACHE_TTL, amsterdam_now
+import orjson
+from datetime import datetime, timedelta, timezone
+from app.config import TICKETMASTER_URL, TICKETMASTER_API_KEY, CACHE_TTL, amsterdam_now_iso_cached
 from app.core.cache import cache
+from app.core.http import http_client
 
+# Validators and parsed events from the last 200 response, for the query
+# starting at "start": {"start": str, "etag": str, "last_mod": str, "events": list}
+_events_meta: dict = {}
 
-async def fetch_events() -> dict:
-    """Fetch events from Ticketmaster API."""
+
+def parse_events(data: dict) -> list:
+    """Extract the panel's event rows from a Ticketmaster response."""
     events = []
+    embedded = data.get("_embedded", {})
+    for event in embedded.get("events", []):
+        venue_name = ""
+        venues = event.get("_embedded", {}).get("venues", [])
+        if venues:
+            venue_name = venues[0].get("name", "")
+
+        date_info = event.get("dates", {}).get("start", {})
+        event_date = date_info.get("localDate", "")
+        event_time = date_info.get("localTime", "")
+
+        classifications = event.get("classifications", [])
+        category = ""
+        if classifications:
+            category = classifications[0].get("segment", {}).get("name", "")
 
+        events.append({
+            "name": event.get("name", "Unknown Event"),
+            "date": f"{event_date} {event_time}".strip(),
+            "venue": venue_name,
+            "category": category,
+            "url": event.get("url", ""),
+        })
+    return events
+
+
+async def fetch_events() -> dict:
+    """Fetch events from Ticketmaster API."""
     if not TICKETMASTER_API_KEY:
         # Return empty if no API key (no sample data)
         return {
             "events": [],
-            "updated_at": amsterdam_now().isoformat(),
+            "updated_at": amsterdam_now_iso_cached(),
         }
 
     try:
-        now = datetime.utcnow()
+        # Start on the hour so repeat requests are identical and can revalidate
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0, tzinfo=None)
         end = now + timedelta(days=14)
+        start = now.isoformat(timespec="seconds") + "Z"
 
         params = {
             "city": "Amsterdam",
             "countryCode": "NL",
-            "startDateTime": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "endDateTime": end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "startDateTime": start,
+            "endDateTime": end.isoformat(timespec="seconds") + "Z",
             "size": 15,
             "apikey": TICKETMASTER_API_KEY,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(TICKETMASTER_URL, params=params, timeout=10.0)
+        headers = {}
+        meta = _events_meta if _events_meta.get("start") == start else None
+        if meta:
+            if meta["etag"]:
+                headers["If-None-Match"] = meta["etag"]
+            if meta["last_mod"]:
+                headers["If-Modified-Since"] = meta["last_mod"]
+
+        response = await http_client.get(TICKETMASTER_URL, params=params, headers=headers, timeout=10.0)
+        if response.status_code == 304 and meta:
+            # Unchanged: skip parsing, reuse the events from last time
+            events = meta["events"]
+        else:
             response.raise_for_status()
-            data = response.json()
-
-            embedded = data.get("_embedded", {})
-            for event in embedded.get("events", []):
-                venue_name = ""
-                venues = event.get("_embedded", {}).get("venues", [])
-                if venues:
-                    venue_name = venues[0].get("name", "")
-
-                date_info = event.get("dates", {}).get("start", {})
-                event_date = date_info.get("localDate", "")
-                event_time = date_info.get("localTime", "")
-
-                classifications = event.get("classifications", [])
-                category = ""
-                if classifications:
-                    category = classifications[0].get("segment", {}).get("name", "")
-
-                events.append({
-                    "name": event.get("name", "Unknown Event"),
-                    "date": f"{event_date} {event_time}".strip(),
-                    "venue": venue_name,
-                    "category": category,
-                    "url": event.get("url", ""),
-                })
+            events = parse_events(orjson.loads(response.content))
+            etag = response.headers.get("etag")
+            last_mod = response.headers.get("last-modified")
+            _events_meta.clear()
+            if etag or last_mod:
+                _events_meta.update(start=start, etag=etag, last_mod=last_mod, events=events)
 
     except Exception as e:
         cached = cache.get("events")
         if cached:
             return cached
-        return {"events": [], "error": str(e), "updated_at": datetime.now().isoformat()}
+        return {"events": [], "error": str(e), "updated_at": amsterdam_now_iso_cached()}
 
     result = {
         "events": events,
-        "updated_at": datetime.now().isoformat(),
+        "updated_at": amsterdam_now_iso_cached(),
     }
 
     cache.set("events", result, CACHE_TTL["events"])
@@ -74,7 +100,4 @@ async def fetch_events() -> dict:
 
 async def get_events() -> dict:
     """Get events from cache or fetch if needed."""
-    cached = cache.get("events")
-    if cached:
-        return cached
-    return await fetch_events()
+    return await cache.get_or_fetch("events", fetch_events, stale_ttl=CACHE_TTL["events"])
@@ -1,74 +1,149 @@
 """FlightRadar24 live flight tracking service"""
 import asyncio
-from typing import Dict, List, Any
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 from FlightRadar24 import FlightRadar24API
+from FlightRadar24 import request as fr24_request
+from app.config import CACHE_TTL, amsterdam_now_hms_cached
+from app.core.cache import cache, ALWAYS_STALE
 
 # Netherlands bounds (covers entire country)
 # North: 53.55, South: 50.75, West: 3.35, East: 7.25
 NL_BOUNDS = "53.55,50.75,3.35,7.25"
 
-# Cache
-_cache: Dict[str, Any] = {
-    "flights": [],
-    "updated": None
-}
-
 fr_api = FlightRadar24API()
 
 
-def fetch_flights_sync() -> List[Dict[str, Any]]:
-    """Fetch flights from FlightRadar24 (synchronous)"""
+class _KeepAliveRequests:
+    """Stand-in for the requests module inside FlightRadar24.request.
+
+    APIRequest calls requests.get()/post() per request, opening a new TLS
+    connection every poll. Those two go through a keep-alive Session per
+    worker thread (Sessions aren't documented as thread-safe); any other
+    attribute falls through to the real requests module.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            self._local.session = session
+            self._sessions.append(session)
+        return session
+
+    def get(self, *args, **kwargs):
+        return self._session().get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        return self._session().post(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def close(self):
+        for session in self._sessions:
+            session.close()
+
+
+_fr24_requests = _KeepAliveRequests()
+# Checked against FlightRadarAPI 1.4 (pinned in pyproject); leave the
+# module alone if a release stops going through its requests global
+if getattr(fr24_request, "requests", None) is requests:
+    fr24_request.requests = _fr24_requests
+
+# The FR24 client blocks; give it its own threads so a slow response can't
+# tie up the default executor the Selenium scrapers run on
+_fr24_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fr24")
+
+# (payload, its JSON): the map polls often, so serialize each refresh only once
+_positions_json: Tuple[Optional[Dict[str, Any]], bytes] = (None, b"")
+
+
+def _flight_row(f) -> Dict[str, Any]:
+    """Map payload for one FlightRadar24 flight"""
+    return {
+        "id": f.id,
+        "callsign": f.callsign or f.registration or "N/A",
+        "lat": f.latitude,
+        "lng": f.longitude,
+        "altitude": f.altitude,  # feet
+        "heading": f.heading,
+        "speed": f.ground_speed,  # knots
+        "vspeed": f.vertical_speed,  # ft/min
+        "aircraft": f.aircraft_code or "???",
+        "airline": f.airline_iata or "",
+        "origin": f.origin_airport_iata or "",
+        "destination": f.destination_airport_iata or "",
+        "registration": f.registration or "",
+        "on_ground": f.on_ground
+    }
+
+
+def fetch_flights_sync() -> Optional[List[Dict[str, Any]]]:
+    """Fetch flights from FlightRadar24 (synchronous); None on error"""
     try:
         flights = fr_api.get_flights(bounds=NL_BOUNDS)
 
-        result = []
-        for f in flights:
-            # Skip ground vehicles and flights on ground
-            if f.on_ground and f.ground_speed < 50:
-                continue
-
-            result.append({
-                "id": f.id,
-                "callsign": f.callsign or f.registration or "N/A",
-                "lat": f.latitude,
-                "lng": f.longitude,
-                "altitude": f.altitude,  # feet
-                "heading": f.heading,
-                "speed": f.ground_speed,  # knots
-                "vspeed": f.vertical_speed,  # ft/min
-                "aircraft": f.aircraft_code or "???",
-                "airline": f.airline_iata or "",
-                "origin": f.origin_airport_iata or "",
-                "destination": f.destination_airport_iata or "",
-                "registration": f.registration or "",
-                "on_ground": f.on_ground
-            })
+        # Skip ground vehicles and flights on ground
+        result = [
+            _flight_row(f) for f in flights
+            if not (f.on_ground and f.ground_speed < 50)
+        ]
 
         print(f"FlightRadar24: {len(result)} aircraft in range")
         return result
 
     except Exception as e:
         print(f"FlightRadar24 error: {e}")
-        return []
+        return None
 
 
-async def fetch_flight_positions() -> None:
+async def fetch_flight_positions() -> Dict[str, Any]:
     """Fetch flight positions (async wrapper)"""
-    loop = asyncio.get_event_loop()
-    flights = await loop.run_in_executor(None, fetch_flights_sync)
+    loop = asyncio.get_running_loop()
+    flights = await loop.run_in_executor(_fr24_executor, fetch_flights_sync)
+
+    if flights is None:
+        # Keep serving the last good positions; the scheduler retries shortly
+        return cache.get("flightradar") or {"flights": [], "count": 0, "updated": None}
 
-    _cache["flights"] = flights
-    _cache["updated"] = datetime.now().strftime("%H:%M:%S")
+    result = {
+        "flights": flights,
+        "count": len(flights),
+        "updated": amsterdam_now_hms_cached()
+    }
+    cache.set("flightradar", result, CACHE_TTL.get("flightradar", 30))
+    return result
 
 
 async def get_flight_positions() -> Dict[str, Any]:
-    """Get cached flight positions"""
-    if not _cache["flights"]:
-        await fetch_flight_positions()
+    """Get cached flight positions.
 
-    return {
-        "flights": _cache["flights"],
-        "count": len(_cache["flights"]),
-        "updated": _cache["updated"]
-    }
+    The scheduler refreshes them in the background, so requests only wait
+    for FlightRadar24 when nothing has been fetched yet.
+    """
+    return await cache.get_or_fetch("flightradar", fetch_flight_positions, stale_ttl=ALWAYS_STALE)
+
+
+async def get_flight_positions_json() -> bytes:
+    """Get cached flight positions, pre-serialized as JSON"""
+    global _positions_json
+    data = await get_flight_positions()
+    if _positions_json[0] is not data:
+        _positions_json = (data, orjson.dumps(data))
+    return _positions_json[1]
+
+
+def close_fr24_executor():
+    """Shut down the FlightRadar24 worker threads and their session"""
+    _fr24_executor.shutdown(wait=False, cancel_futures=True)
+    _fr24_requests.close()
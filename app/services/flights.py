@@ -8,8 +8,9 @@ import shutil
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-from app.config import amsterdam_now, CACHE_TTL
+from app.config import amsterdam_now, CACHE_TTL, amsterdam_now_hms_cached
 from app.core.cache import cache
+from app.core.http import http_client
 
 # Try to import curl transport for better scraping
 try:
@@ -28,6 +29,14 @@ if sys.platform != "linux":
 else:
     HAS_WEBDRIVER_MANAGER = False
 
+# Browser-impersonating client for the Schiphol pages, created on first use
+# and kept so repeat scrapes reuse its connections
+_scrape_client: Optional[httpx.AsyncClient] = None
+
+# Validators and parsed flights from each Schiphol page's last 200 response:
+# {url: {"etag": str, "last_mod": str, "parsed": list}}
+_schiphol_meta: Dict[str, Dict] = {}
+
 # Schiphol URLs
 SCHIPHOL_DEPARTURES_URL = "https://www.schiphol.nl/en/departures/"
 SCHIPHOL_ARRIVALS_URL = "https://www.schiphol.nl/en/arrivals/"
@@ -40,11 +49,23 @@ SCHIPHOL_API_URL = "https://api.schiphol.nl/public-flights/flights"
 SCHIPHOL_APP_ID = None  # Set via SCHIPHOL_APP_ID env var
 SCHIPHOL_APP_KEY = None  # Set via SCHIPHOL_APP_KEY env var
 
+# Flights shown per direction in the panel
+FLIGHTS_SHOWN = 12
+
 # Common airlines and airport codes
-AIRLINES = ["KLM", "Transavia", "EasyJet", "Vueling", "British Airways", "Air France", "Lufthansa"]
+AIRLINES = ("KLM", "Transavia", "EasyJet", "Vueling", "British Airways", "Air France", "Lufthansa")
+
+# Scraped-row destination fallbacks: words that look like airport codes but
+# aren't, and text patterns tried in order
+NOT_AIRPORT_CODES = frozenset({"NOW", "GATE", "TER"})
+DEST_PATTERNS = (
+    re.compile(r'to\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'),
+    re.compile(r'→\s*([A-Z][a-z]+)'),
+    re.compile(r'([A-Z][a-z]+\s+(?:Airport|International))'),
+)
 
-def parse_schiphol_html(html_content: str, flight_type: str = "departure") -> List[Dict]:
-    """Parse Schiphol HTML page for flight data using BeautifulSoup"""
+def parse_schiphol_html(html_content: str, flight_type: str = "departure", limit: int = 15) -> List[Dict]:
+    """Parse Schiphol HTML page for flight data using BeautifulSoup (at most `limit` flights)"""
     flights = []
     
     if not html_content:
@@ -76,6 +97,8 @@ def parse_schiphol_html(html_content: str, flight_type: str = "departure") -> Li
                 flight_elements.extend(rows)
         
         for element in flight_elements[:30]:  # Limit to 30
+            if len(flights) >= limit:
+                break
             try:
                 text = element.get_text()
                 
@@ -104,17 +127,12 @@ def parse_schiphol_html(html_content: str, flight_type: str = "departure") -> Li
                 else:
                     # Try to find airport codes (3 letters)
                     airport_match = re.search(r'\b([A-Z]{3})\b', text)
-                    if airport_match and airport_match.group(1) not in ['NOW', 'GATE', 'TER']:
+                    if airport_match and airport_match.group(1) not in NOT_AIRPORT_CODES:
                         destination = airport_match.group(1)
                     else:
                         # Look for common destination patterns
-                        dest_patterns = [
-                            r'to\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-                            r'→\s*([A-Z][a-z]+)',
-                            r'([A-Z][a-z]+\s+(?:Airport|International))',
-                        ]
-                        for pattern in dest_patterns:
-                            dest_match = re.search(pattern, text)
+                        for pattern in DEST_PATTERNS:
+                            dest_match = pattern.search(text)
                             if dest_match:
                                 destination = dest_match.group(1).strip()
                                 break
@@ -182,7 +200,7 @@ def parse_schiphol_html(html_content: str, flight_type: str = "departure") -> Li
     
     # If we already found flights, return early
     if flights:
-        return flights[:15]
+        return flights[:limit]
     
     # Look for JSON data embedded in script tags
     # Schiphol often loads flight data via JavaScript/JSON
@@ -302,7 +320,7 @@ def parse_schiphol_html(html_content: str, flight_type: str = "departure") -> Li
         except Exception as e:
             print(f"Error parsing HTML fallback: {e}")
     
-    return flights[:15]  # Limit to 15 flights
+    return flights[:limit]
 
 
 async def fetch_schiphol_api() -> Optional[Dict]:
@@ -316,97 +334,96 @@ async def fetch_schiphol_api() -> Optional[Dict]:
         return None
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Fetch departures
-            dep_response = await client.get(
-                SCHIPHOL_API_URL,
-                headers={
-                    "app_id": app_id,
-                    "app_key": app_key,
-                    "ResourceVersion": "v4",
-                    "Accept": "application/json"
-                },
-                params={
-                    "flightDirection": "D",
-                    "includedelays": "true",
-                    "page": 0,
-                    "sort": "+scheduleTime"
-                }
-            )
-            
-            arr_response = await client.get(
-                SCHIPHOL_API_URL,
-                headers={
-                    "app_id": app_id,
-                    "app_key": app_key,
-                    "ResourceVersion": "v4",
-                    "Accept": "application/json"
-                },
-                params={
-                    "flightDirection": "A",
-                    "includedelays": "true",
-                    "page": 0,
-                    "sort": "+scheduleTime"
-                }
-            )
-            
-            departures = []
-            arrivals = []
-            
-            if dep_response.status_code == 200:
-                dep_data = dep_response.json()
-                for flight in dep_data.get("flights", [])[:15]:
-                    schedule_time = flight.get("scheduleTime", "")
-                    now = amsterdam_now()
-                    # Parse time and calculate minutes until departure
-                    try:
-                        flight_time = datetime.fromisoformat(schedule_time.replace("Z", "+00:00"))
-                        ams_time = flight_time.astimezone(now.tzinfo)
-                        minutes = int((ams_time - now).total_seconds() / 60)
-                        
-                        if 0 <= minutes <= 180:  # Next 3 hours
-                            departures.append({
-                                "code": flight.get("flightNumber", {}).get("publicFlightNumber", ""),
-                                "airline": flight.get("flightNumber", {}).get("airline", {}).get("code", ""),
-                                "destination": flight.get("route", {}).get("destinations", [""])[0] if flight.get("route", {}).get("destinations") else "Unknown",
-                                "time": ams_time.strftime("%H:%M"),
-                                "status": flight.get("flightStatus", "on-time"),
-                                "delay": flight.get("scheduleTime", {}).get("delay", 0),
-                                "gate": flight.get("gate", ""),
-                                "terminal": flight.get("terminal", "")
-                            })
-                    except:
-                        continue
-            
-            if arr_response.status_code == 200:
-                arr_data = arr_response.json()
-                for flight in arr_data.get("flights", [])[:15]:
-                    schedule_time = flight.get("scheduleTime", "")
-                    now = amsterdam_now()
-                    try:
-                        flight_time = datetime.fromisoformat(schedule_time.replace("Z", "+00:00"))
-                        ams_time = flight_time.astimezone(now.tzinfo)
-                        minutes = int((ams_time - now).total_seconds() / 60)
-                        
-                        if -30 <= minutes <= 180:  # Past 30 min to next 3 hours
-                            arrivals.append({
-                                "code": flight.get("flightNumber", {}).get("publicFlightNumber", ""),
-                                "airline": flight.get("flightNumber", {}).get("airline", {}).get("code", ""),
-                                "origin": flight.get("route", {}).get("destinations", [""])[0] if flight.get("route", {}).get("destinations") else "Unknown",
-                                "time": ams_time.strftime("%H:%M"),
-                                "status": flight.get("flightStatus", "on-time"),
-                                "delay": flight.get("scheduleTime", {}).get("delay", 0),
-                                "gate": flight.get("gate", ""),
-                                "terminal": flight.get("terminal", "")
-                            })
-                    except:
-                        continue
-            
-            if departures or arrivals:
-                return {
-                    "departures": departures,
-                    "arrivals": arrivals
-                }
+        # Fetch departures
+        dep_response = await http_client.get(
+            SCHIPHOL_API_URL,
+            headers={
+                "app_id": app_id,
+                "app_key": app_key,
+                "ResourceVersion": "v4",
+                "Accept": "application/json"
+            },
+            params={
+                "flightDirection": "D",
+                "includedelays": "true",
+                "page": 0,
+                "sort": "+scheduleTime"
+            }
+        )
+        
+        arr_response = await http_client.get(
+            SCHIPHOL_API_URL,
+            headers={
+                "app_id": app_id,
+                "app_key": app_key,
+                "ResourceVersion": "v4",
+                "Accept": "application/json"
+            },
+            params={
+                "flightDirection": "A",
+                "includedelays": "true",
+                "page": 0,
+                "sort": "+scheduleTime"
+            }
+        )
+        
+        departures = []
+        arrivals = []
+        
+        if dep_response.status_code == 200:
+            dep_data = dep_response.json()
+            for flight in dep_data.get("flights", [])[:15]:
+                schedule_time = flight.get("scheduleTime", "")
+                now = amsterdam_now()
+                # Parse time and calculate minutes until departure
+                try:
+                    flight_time = datetime.fromisoformat(schedule_time.replace("Z", "+00:00"))
+                    ams_time = flight_time.astimezone(now.tzinfo)
+                    minutes = int((ams_time - now).total_seconds() / 60)
+                    
+                    if 0 <= minutes <= 180:  # Next 3 hours
+                        departures.append({
+                            "code": flight.get("flightNumber", {}).get("publicFlightNumber", ""),
+                            "airline": flight.get("flightNumber", {}).get("airline", {}).get("code", ""),
+                            "destination": flight.get("route", {}).get("destinations", [""])[0] if flight.get("route", {}).get("destinations") else "Unknown",
+                            "time": ams_time.strftime("%H:%M"),
+                            "status": flight.get("flightStatus", "on-time"),
+                            "delay": flight.get("scheduleTime", {}).get("delay", 0),
+                            "gate": flight.get("gate", ""),
+                            "terminal": flight.get("terminal", "")
+                        })
+                except:
+                    continue
+        
+        if arr_response.status_code == 200:
+            arr_data = arr_response.json()
+            for flight in arr_data.get("flights", [])[:15]:
+                schedule_time = flight.get("scheduleTime", "")
+                now = amsterdam_now()
+                try:
+                    flight_time = datetime.fromisoformat(schedule_time.replace("Z", "+00:00"))
+                    ams_time = flight_time.astimezone(now.tzinfo)
+                    minutes = int((ams_time - now).total_seconds() / 60)
+                    
+                    if -30 <= minutes <= 180:  # Past 30 min to next 3 hours
+                        arrivals.append({
+                            "code": flight.get("flightNumber", {}).get("publicFlightNumber", ""),
+                            "airline": flight.get("flightNumber", {}).get("airline", {}).get("code", ""),
+                            "origin": flight.get("route", {}).get("destinations", [""])[0] if flight.get("route", {}).get("destinations") else "Unknown",
+                            "time": ams_time.strftime("%H:%M"),
+                            "status": flight.get("flightStatus", "on-time"),
+                            "delay": flight.get("scheduleTime", {}).get("delay", 0),
+                            "gate": flight.get("gate", ""),
+                            "terminal": flight.get("terminal", "")
+                        })
+                except:
+                    continue
+        
+        if departures or arrivals:
+            return {
+                "departures": departures,
+                "arrivals": arrivals
+            }
     except Exception as e:
         print(f"Schiphol API error: {e}")
     
@@ -654,7 +671,7 @@ async def get_flights_data() -> Dict:
                 result = {
                     "departures": departures,
                     "arrivals": arrivals,
-                    "updated": amsterdam_now().strftime("%H:%M:%S"),
+                    "updated": amsterdam_now_hms_cached(),
                     "runway": None,
                     "source": "flightradar24"
                 }
@@ -669,52 +686,36 @@ async def get_flights_data() -> Dict:
         return {
             "departures": api_data.get("departures", []),
             "arrivals": api_data.get("arrivals", []),
-            "updated": amsterdam_now().strftime("%H:%M:%S"),
+            "updated": amsterdam_now_hms_cached(),
             "runway": None,
             "source": "api"
         }
     
-    # Last resort: Try Schiphol HTML scraping
-    try:
-        async with httpx.AsyncClient(
-            transport=AsyncCurlTransport(impersonate="chrome110"),
-            timeout=15.0
-        ) as client:
-            # Try departures
-            try:
-                dep_response = await client.get(
-                    SCHIPHOL_DEPARTURES_URL,
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                )
-                if dep_response.status_code == 200:
-                    departures = parse_schiphol_html(dep_response.text, "departure")
-                    print(f"Scraped {len(departures)} departures from Schiphol")
-            except Exception as e:
-                print(f"Error scraping departures: {e}")
-            
-            # Try arrivals
-            try:
-                arr_response = await client.get(
-                    SCHIPHOL_ARRIVALS_URL,
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                )
-                if arr_response.status_code == 200:
-                    arrivals = parse_schiphol_html(arr_response.text, "arrival")
-                    print(f"Scraped {len(arrivals)} arrivals from Schiphol")
-            except Exception as e:
-                print(f"Error scraping arrivals: {e}")
-    
-    except Exception as e:
-        print(f"Error fetching flight data: {e}")
+    # Last resort: Try Schiphol HTML scraping. Departures and arrivals are
+    # independent pages, fetched together; gather hands back each page's
+    # error instead of raising
+    dep_result, arr_result = await asyncio.gather(
+        scrape_schiphol_page(SCHIPHOL_DEPARTURES_URL, "departure"),
+        scrape_schiphol_page(SCHIPHOL_ARRIVALS_URL, "arrival"),
+        return_exceptions=True,
+    )
+
+    if isinstance(dep_result, Exception):
+        print(f"Error scraping departures: {dep_result}")
+    else:
+        departures = dep_result
+        print(f"Scraped {len(departures)} departures from Schiphol")
+
+    if isinstance(arr_result, Exception):
+        print(f"Error scraping arrivals: {arr_result}")
+    else:
+        arrivals = arr_result
+        print(f"Scraped {len(arrivals)} arrivals from Schiphol")
     
     result = {
-        "departures": departures[:12],
-        "arrivals": arrivals[:12],
-        "updated": amsterdam_now().strftime("%H:%M:%S"),
+        "departures": departures[:FLIGHTS_SHOWN],
+        "arrivals": arrivals[:FLIGHTS_SHOWN],
+        "updated": amsterdam_now_hms_cached(),
         "runway": None,
         "source": "scraping" if departures or arrivals else "none"
     }
@@ -724,6 +725,53 @@ async def get_flights_data() -> Dict:
     return result
 
 
+async def scrape_schiphol_page(url: str, flight_type: str) -> List[Dict]:
+    """Conditional GET of a Schiphol flights page; a 304 reuses the flights parsed last time."""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    meta = _schiphol_meta.get(url)
+    if meta:
+        if meta["etag"]:
+            headers["If-None-Match"] = meta["etag"]
+        if meta["last_mod"]:
+            headers["If-Modified-Since"] = meta["last_mod"]
+
+    response = await _get_scrape_client().get(url, headers=headers)
+    if response.status_code == 304 and meta:
+        return meta["parsed"]
+    if response.status_code != 200:
+        return []
+
+    parsed = parse_schiphol_html(response.text, flight_type, limit=FLIGHTS_SHOWN)
+    etag = response.headers.get("etag")
+    last_mod = response.headers.get("last-modified")
+    if parsed and (etag or last_mod):
+        _schiphol_meta[url] = {"etag": etag, "last_mod": last_mod, "parsed": parsed}
+    else:
+        _schiphol_meta.pop(url, None)
+    return parsed
+
+
+def _get_scrape_client() -> httpx.AsyncClient:
+    """Client for scraping Schiphol; the shared client without curl_cffi"""
+    global _scrape_client
+    if not HAS_CURL_CFFI:
+        return http_client
+    if _scrape_client is None:
+        _scrape_client = httpx.AsyncClient(
+            transport=AsyncCurlTransport(impersonate="chrome110"),
+            timeout=15.0
+        )
+    return _scrape_client
+
+
+async def close_scrape_client():
+    """Close the Schiphol scraping client (app shutdown)"""
+    if _scrape_client is not None:
+        await _scrape_client.aclose()
+
+
 async def fetch_flights() -> Dict:
     """Fetch flights data (for scheduler)"""
     return await get_flights_data()
@@ -731,10 +779,7 @@ async def fetch_flights() -> Dict:
 
 async def get_flights() -> Dict:
     """Get flights from cache or fetch if needed."""
-    cached = cache.get("flights")
-    if cached:
-        return cached
-    return await get_flights_data()
+    return await cache.get_or_fetch("flights", get_flights_data, stale_ttl=CACHE_TTL.get("flights", 120))
 
 async def get_flight_status(flight_code: str) -> Dict:
     """Get status for a specific flight"""
@@ -742,5 +787,5 @@ async def get_flight_status(flight_code: str) -> Dict:
     return {
         "code": flight_code,
         "status": "unknown",
-        "updated": amsterdam_now().strftime("%H:%M:%S")
+        "updated": amsterdam_now_hms_cached()
     }
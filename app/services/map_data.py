@@ -1,8 +1,8 @@
 """Map Data Service - Real-time transit positions for Amsterdam"""
-import httpx
 from datetime import datetime
 from typing import List, Dict
-from app.config import amsterdam_now
+from app.config import amsterdam_now_hms_cached
+from app.core.http import http_client
 
 # OVapi endpoint for real-time vehicle positions
 OVAPI_URL = "https://v0.ovapi.nl/vehicle"
@@ -20,17 +20,16 @@ async def get_transit_positions() -> Dict:
     vehicles = []
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                response = await client.get(OVAPI_URL)
-                if response.status_code == 200:
-                    data = response.json()
-                    # Filter for Amsterdam area vehicles
-                    for vehicle_id, vehicle in data.items():
-                        if is_in_amsterdam(vehicle):
-                            vehicles.append(parse_vehicle(vehicle_id, vehicle))
-            except Exception as e:
-                print(f"OVapi error: {e}")
+        try:
+            response = await http_client.get(OVAPI_URL)
+            if response.status_code == 200:
+                data = response.json()
+                # Filter for Amsterdam area vehicles
+                for vehicle_id, vehicle in data.items():
+                    if is_in_amsterdam(vehicle):
+                        vehicles.append(parse_vehicle(vehicle_id, vehicle))
+        except Exception as e:
+            print(f"OVapi error: {e}")
 
     except Exception as e:
         print(f"Error fetching transit positions: {e}")
@@ -38,7 +37,7 @@ async def get_transit_positions() -> Dict:
     # Return empty if no real data available (no sample data)
     return {
         "vehicles": vehicles[:50],  # Limit to 50 vehicles
-        "updated": amsterdam_now().strftime("%H:%M:%S"),
+        "updated": amsterdam_now_hms_cached(),
         "count": len(vehicles)
     }
 
@@ -85,5 +84,5 @@ async def get_map_markers() -> Dict:
             {"lat": 52.3738, "lng": 4.8910, "name": "Anne Frank House", "type": "landmark"},
             {"lat": 52.3664, "lng": 4.8795, "name": "Vondelpark", "type": "park"},
         ],
-        "updated": amsterdam_now().strftime("%H:%M:%S")
+        "updated": amsterdam_now_hms_cached()
     }
@@ -1,33 +1,33 @@
-import httpx
 import yfinance as yf
 from datetime import datetime
-from app.config import COINGECKO_URL, CACHE_TTL, amsterdam_now
+from app.config import COINGECKO_URL, CACHE_TTL, amsterdam_now_iso_cached
 from app.core.cache import cache
+from app.core.http import http_client
+
+
+MARKET_PARAMS = {
+    "ids": "bitcoin,ethereum,solana",
+    "vs_currencies": "eur,usd",
+    "include_24hr_change": "true",
+}
 
 
 async def fetch_crypto() -> dict:
     """Fetch crypto prices from CoinGecko."""
     try:
-        params = {
-            "ids": "bitcoin,ethereum,solana",
-            "vs_currencies": "eur,usd",
-            "include_24hr_change": "true",
-        }
+        response = await http_client.get(COINGECKO_URL, params=MARKET_PARAMS, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(COINGECKO_URL, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-
-            crypto = {}
-            for coin_id, values in data.items():
-                crypto[coin_id.upper()] = {
-                    "eur": values.get("eur"),
-                    "usd": values.get("usd"),
-                    "change_24h": values.get("eur_24h_change"),
-                }
+        crypto = {}
+        for coin_id, values in data.items():
+            crypto[coin_id.upper()] = {
+                "eur": values.get("eur"),
+                "usd": values.get("usd"),
+                "change_24h": values.get("eur_24h_change"),
+            }
 
-            return crypto
+        return crypto
 
     except Exception:
         return {}
@@ -60,7 +60,7 @@ async def fetch_markets() -> dict:
     result = {
         "crypto": crypto,
         "stocks": stocks,
-        "updated_at": amsterdam_now().isoformat(),
+        "updated_at": amsterdam_now_iso_cached(),
     }
 
     cache.set("markets", result, CACHE_TTL["markets"])
@@ -69,7 +69,4 @@ async def fetch_markets() -> dict:
 
 async def get_markets() -> dict:
     """Get markets from cache or fetch if needed."""
-    cached = cache.get("markets")
-    if cached:
-        return cached
-    return await fetch_markets()
+    return await cache.get_or_fetch("markets", fetch_markets, stale_ttl=CACHE_TTL["markets"])
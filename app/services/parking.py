@@ -1,4 +1,3 @@
-import httpx
 import re
 import json
 import asyncio
@@ -15,8 +14,9 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from app.config import CACHE_TTL, amsterdam_now
+from app.config import CACHE_TTL, amsterdam_now_iso_cached, amsterdam_now_hms_cached
 from app.core.cache import cache
+from app.core.http import http_client
 
 # Only import webdriver_manager on non-Linux (local dev)
 if sys.platform != "linux":
@@ -368,78 +368,77 @@ async def fetch_parking_from_api() -> List[Dict]:
     garages = []
     
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            # Try the locations JSON endpoint first
-            try:
-                print(f"Trying: {AMSTERDAM_PARKING_LOCATIONS_URL}")
-                response = await client.get(AMSTERDAM_PARKING_LOCATIONS_URL)
-                print(f"Response status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        print(f"JSON parsed successfully, type: {type(data)}")
-                        
-                        # Handle different JSON structures
-                        if isinstance(data, list):
-                            items = data
-                            print(f"Found list with {len(items)} items")
-                        elif isinstance(data, dict):
-                            items = data.get('features', []) or data.get('results', []) or data.get('data', []) or data.get('parkeerlocaties', [])
-                            print(f"Found dict with keys: {list(data.keys())[:10]}")
-                        else:
-                            items = []
-                        
-                        for item in items[:50]:  # Limit to first 50
-                            garage = parse_api_garage(item)
-                            if garage:
-                                garages.append(garage)
-                        
-                        if garages:
-                            print(f"Fetched {len(garages)} garages from Amsterdam Open Data API")
-                            return garages
-                        else:
-                            print("No garages parsed from API data")
-                            # Debug: show first item structure
-                            if items:
-                                print(f"First item structure: {items[0]}")
-                    except json.JSONDecodeError as e:
-                        print(f"JSON decode error: {e}")
-                        print(f"Response preview: {response.text[:500]}")
-            except Exception as e:
-                print(f"Error fetching from locations API: {e}")
-                import traceback
-                traceback.print_exc()
+        # Try the locations JSON endpoint first
+        try:
+            print(f"Trying: {AMSTERDAM_PARKING_LOCATIONS_URL}")
+            response = await http_client.get(AMSTERDAM_PARKING_LOCATIONS_URL, timeout=15.0, follow_redirects=True)
+            print(f"Response status: {response.status_code}")
             
-            # Try the official API endpoint
-            try:
-                print(f"Trying: {AMSTERDAM_PARKING_API_URL}")
-                response = await client.get(AMSTERDAM_PARKING_API_URL, headers={
-                    'Accept': 'application/json'
-                })
-                print(f"API Response status: {response.status_code}")
-                
-                if response.status_code == 200:
+            if response.status_code == 200:
+                try:
                     data = response.json()
+                    print(f"JSON parsed successfully, type: {type(data)}")
                     
-                    if isinstance(data, dict):
-                        items = data.get('results', []) or data.get('features', []) or data.get('data', [])
-                    elif isinstance(data, list):
+                    # Handle different JSON structures
+                    if isinstance(data, list):
                         items = data
+                        print(f"Found list with {len(items)} items")
+                    elif isinstance(data, dict):
+                        items = data.get('features', []) or data.get('results', []) or data.get('data', []) or data.get('parkeerlocaties', [])
+                        print(f"Found dict with keys: {list(data.keys())[:10]}")
                     else:
                         items = []
                     
-                    for item in items[:50]:
+                    for item in items[:50]:  # Limit to first 50
                         garage = parse_api_garage(item)
                         if garage:
                             garages.append(garage)
                     
                     if garages:
-                        print(f"Fetched {len(garages)} garages from Amsterdam API")
+                        print(f"Fetched {len(garages)} garages from Amsterdam Open Data API")
                         return garages
-            except Exception as e:
-                print(f"Error fetching from API endpoint: {e}")
-    
+                    else:
+                        print("No garages parsed from API data")
+                        # Debug: show first item structure
+                        if items:
+                            print(f"First item structure: {items[0]}")
+                except json.JSONDecodeError as e:
+                    print(f"JSON decode error: {e}")
+                    print(f"Response preview: {response.text[:500]}")
+        except Exception as e:
+            print(f"Error fetching from locations API: {e}")
+            import traceback
+            traceback.print_exc()
+        
+        # Try the official API endpoint
+        try:
+            print(f"Trying: {AMSTERDAM_PARKING_API_URL}")
+            response = await http_client.get(AMSTERDAM_PARKING_API_URL, headers={
+                'Accept': 'application/json'
+            }, timeout=15.0, follow_redirects=True)
+            print(f"API Response status: {response.status_code}")
+            
+            if response.status_code == 200:
+                data = response.json()
+                
+                if isinstance(data, dict):
+                    items = data.get('results', []) or data.get('features', []) or data.get('data', [])
+                elif isinstance(data, list):
+                    items = data
+                else:
+                    items = []
+                
+                for item in items[:50]:
+                    garage = parse_api_garage(item)
+                    if garage:
+                        garages.append(garage)
+                
+                if garages:
+                    print(f"Fetched {len(garages)} garages from Amsterdam API")
+                    return garages
+        except Exception as e:
+            print(f"Error fetching from API endpoint: {e}")
+
     except Exception as e:
         print(f"Error fetching parking from API: {e}")
         import traceback
@@ -522,8 +521,8 @@ async def fetch_parking() -> dict:
     result = {
         "garages": garages[:30],  # Limit to top 30
         "source": source,
-        "updated_at": amsterdam_now().isoformat(),
-        "updated": amsterdam_now().strftime("%H:%M:%S"),
+        "updated_at": amsterdam_now_iso_cached(),
+        "updated": amsterdam_now_hms_cached(),
     }
 
     cache.set("parking", result, CACHE_TTL.get("parking", 300))
@@ -532,7 +531,4 @@ async def fetch_parking() -> dict:
 
 async def get_parking() -> dict:
     """Get parking data from cache or fetch if needed."""
-    cached = cache.get("parking")
-    if cached:
-        return cached
-    return await fetch_parking()
+    return await cache.get_or_fetch("parking", fetch_parking, stale_ttl=CACHE_TTL.get("parking", 300))
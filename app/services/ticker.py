@@ -1,9 +1,9 @@
 """News Ticker Service - Aggregates headlines for scrolling ticker"""
-import httpx
 import feedparser
 from datetime import datetime
 from typing import List, Dict
-from app.config import amsterdam_now
+from app.config import amsterdam_now_hms_cached
+from app.core.http import http_client
 
 # News RSS feeds
 NEWS_FEEDS = [
@@ -17,21 +17,20 @@ async def get_ticker_data() -> Dict:
     headlines = []
 
     try:
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            for feed_url, source in NEWS_FEEDS:
-                try:
-                    response = await client.get(feed_url)
-                    if response.status_code == 200:
-                        feed = feedparser.parse(response.text)
-                        for entry in feed.entries[:5]:
-                            headlines.append({
-                                "text": entry.title,
-                                "source": source,
-                                "url": entry.link if hasattr(entry, 'link') else None,
-                                "alert": is_alert_headline(entry.title)
-                            })
-                except Exception:
-                    continue
+        for feed_url, source in NEWS_FEEDS:
+            try:
+                response = await http_client.get(feed_url, timeout=8.0)
+                if response.status_code == 200:
+                    feed = feedparser.parse(response.text)
+                    for entry in feed.entries[:5]:
+                        headlines.append({
+                            "text": entry.title,
+                            "source": source,
+                            "url": entry.link if hasattr(entry, 'link') else None,
+                            "alert": is_alert_headline(entry.title)
+                        })
+            except Exception:
+                continue
 
     except Exception as e:
         print(f"Error fetching ticker data: {e}")
@@ -46,7 +45,7 @@ async def get_ticker_data() -> Dict:
 
     return {
         "headlines": headlines[:15],
-        "updated": amsterdam_now().strftime("%H:%M:%S")
+        "updated": amsterdam_now_hms_cached()
     }
 
 def is_alert_headline(text: str) -> bool:
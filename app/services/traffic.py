@@ -14,7 +14,7 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from app.config import CACHE_TTL, amsterdam_now
+from app.config import CACHE_TTL, amsterdam_now_iso_cached, amsterdam_now_hms_cached
 from app.core.cache import cache
 
 # Only import webdriver_manager on non-Linux (local dev)
@@ -370,8 +370,8 @@ async def fetch_traffic() -> dict:
         "items": traffic_items[:30],  # Limit to top 30
         "total_jams": len(traffic_items),
         "total_delay": sum(item.get("delay", 0) for item in traffic_items),
-        "updated_at": amsterdam_now().isoformat(),
-        "updated": amsterdam_now().strftime("%H:%M:%S"),
+        "updated_at": amsterdam_now_iso_cached(),
+        "updated": amsterdam_now_hms_cached(),
     }
 
     cache.set("traffic", result, CACHE_TTL.get("traffic", 180))
@@ -380,7 +380,4 @@ async def fetch_traffic() -> dict:
 
 async def get_traffic() -> dict:
     """Get traffic data from cache or fetch if needed."""
-    cached = cache.get("traffic")
-    if cached:
-        return cached
-    return await fetch_traffic()
+    return await cache.get_or_fetch("traffic", fetch_traffic, stale_ttl=CACHE_TTL.get("traffic", 180))
@@ -1,5 +1,4 @@
 """Vision Detection Service - Object detection on camera feeds"""
-import httpx
 import base64
 import asyncio
 import subprocess
@@ -9,8 +8,9 @@ import io
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
-from app.config import amsterdam_now, CACHE_TTL
+from app.config import CACHE_TTL, amsterdam_now_hms_cached
 from app.core.cache import cache
+from app.core.http import http_client
 from app.core.database import save_detection
 
 # Colors for bounding boxes (RGB)
@@ -51,37 +51,36 @@ async def detect_objects_google_vision(image_bytes: bytes) -> List[Dict]:
         # Encode image to base64
         image_base64 = base64.b64encode(image_bytes).decode('utf-8')
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{GOOGLE_VISION_API_URL}?key={api_key}",
-                json={
-                    "requests": [{
-                        "image": {
-                            "content": image_base64
-                        },
-                        "features": [{
-                            "type": "OBJECT_LOCALIZATION",
-                            "maxResults": 20
-                        }]
+        response = await http_client.post(
+            f"{GOOGLE_VISION_API_URL}?key={api_key}",
+            json={
+                "requests": [{
+                    "image": {
+                        "content": image_base64
+                    },
+                    "features": [{
+                        "type": "OBJECT_LOCALIZATION",
+                        "maxResults": 20
                     }]
-                }
-            )
+                }]
+            }
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            objects = []
             
-            if response.status_code == 200:
-                data = response.json()
-                objects = []
-                
-                if 'responses' in data and len(data['responses']) > 0:
-                    localized_objects = data['responses'][0].get('localizedObjectAnnotations', [])
-                    
-                    for obj in localized_objects:
-                        objects.append({
-                            "name": obj.get('name', 'Unknown'),
-                            "score": obj.get('score', 0),
-                            "bounding_box": obj.get('boundingPoly', {}).get('normalizedVertices', [])
-                        })
+            if 'responses' in data and len(data['responses']) > 0:
+                localized_objects = data['responses'][0].get('localizedObjectAnnotations', [])
                 
-                return objects
+                for obj in localized_objects:
+                    objects.append({
+                        "name": obj.get('name', 'Unknown'),
+                        "score": obj.get('score', 0),
+                        "bounding_box": obj.get('boundingPoly', {}).get('normalizedVertices', [])
+                    })
+            
+            return objects
     except Exception as e:
         print(f"Google Vision API error: {e}")
     
@@ -103,43 +102,44 @@ async def detect_objects_huggingface(image_bytes: bytes) -> List[Dict]:
             "Content-Type": "image/jpeg"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
+        response = await http_client.post(
+            HUGGINGFACE_API_URL,
+            headers=headers,
+            content=image_bytes,
+            timeout=30.0
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            objects = []
+
+            if isinstance(data, list):
+                for item in data:
+                    objects.append({
+                        "label": item.get('label', 'Unknown'),
+                        "score": item.get('score', 0),
+                        "box": item.get('box', {})
+                    })
+
+            return objects
+        elif response.status_code == 503:
+            # Model is loading, wait and retry once
+            print("Hugging Face model loading, waiting...")
+            await asyncio.sleep(5)
+            response = await http_client.post(
                 HUGGINGFACE_API_URL,
                 headers=headers,
-                content=image_bytes
+                content=image_bytes,
+                timeout=30.0
             )
-
             if response.status_code == 200:
                 data = response.json()
-                objects = []
-
                 if isinstance(data, list):
-                    for item in data:
-                        objects.append({
-                            "label": item.get('label', 'Unknown'),
-                            "score": item.get('score', 0),
-                            "box": item.get('box', {})
-                        })
-
-                return objects
-            elif response.status_code == 503:
-                # Model is loading, wait and retry once
-                print("Hugging Face model loading, waiting...")
-                await asyncio.sleep(5)
-                response = await client.post(
-                    HUGGINGFACE_API_URL,
-                    headers=headers,
-                    content=image_bytes
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if isinstance(data, list):
-                        return [{"label": item.get('label', 'Unknown'), "score": item.get('score', 0), "box": item.get('box', {})} for item in data]
-            elif response.status_code == 401:
-                print("Hugging Face API: Invalid or missing API key")
-            else:
-                print(f"Hugging Face API error: {response.status_code}")
+                    return [{"label": item.get('label', 'Unknown'), "score": item.get('score', 0), "box": item.get('box', {})} for item in data]
+        elif response.status_code == 401:
+            print("Hugging Face API: Invalid or missing API key")
+        else:
+            print(f"Hugging Face API error: {response.status_code}")
     except Exception as e:
         print(f"Hugging Face API error: {e}")
 
@@ -254,17 +254,15 @@ async def extract_youtube_thumbnail(video_id: str) -> Optional[bytes]:
         # Try maxresdefault first (highest quality)
         thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(thumbnail_url)
-            if response.status_code == 200 and len(response.content) > 1000:
-                return response.content
-        
+        response = await http_client.get(thumbnail_url)
+        if response.status_code == 200 and len(response.content) > 1000:
+            return response.content
+
         # Fallback to hqdefault
         thumbnail_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(thumbnail_url)
-            if response.status_code == 200:
-                return response.content
+        response = await http_client.get(thumbnail_url)
+        if response.status_code == 200:
+            return response.content
     except Exception as e:
         print(f"Error extracting thumbnail: {e}")
     
@@ -292,17 +290,16 @@ async def detect_camera_objects(camera_id: str, video_id: Optional[str] = None,
         timestamp = random.randint(3, 10)  # Random timestamp between 3-10 seconds
         image_bytes = await extract_youtube_frame(video_id, timestamp=timestamp)
     elif image_url:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(image_url)
-            if response.status_code == 200:
-                image_bytes = response.content
-    
+        response = await http_client.get(image_url)
+        if response.status_code == 200:
+            image_bytes = response.content
+
     if not image_bytes:
         return {
             "camera_id": camera_id,
             "objects": [],
             "detection_count": 0,
-            "updated": amsterdam_now().strftime("%H:%M:%S"),
+            "updated": amsterdam_now_hms_cached(),
             "source": None
         }
     
@@ -331,7 +328,7 @@ async def detect_camera_objects(camera_id: str, video_id: Optional[str] = None,
         "objects": objects[:10],  # Limit to top 10
         "detection_count": len(objects),
         "summary": detection_summary,
-        "updated": amsterdam_now().strftime("%H:%M:%S"),
+        "updated": amsterdam_now_hms_cached(),
         "source": source
     }
 
@@ -370,7 +367,7 @@ async def fetch_vision() -> Dict:
 
     result = {
         "detections": all_detections,
-        "updated": amsterdam_now().strftime("%H:%M:%S"),
+        "updated": amsterdam_now_hms_cached(),
         "camera_count": len(all_detections)
     }
 
@@ -558,13 +555,12 @@ async def refresh_annotated_frame(camera_id: str) -> Optional[bytes]:
             print(f"[VISION] Frame extraction returned None")
     elif image_url:
         print(f"[VISION] Fetching image from URL: {image_url}")
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(image_url)
-            if response.status_code == 200:
-                image_bytes = response.content
-                print(f"[VISION] Got image from URL: {len(image_bytes)} bytes")
-            else:
-                print(f"[VISION] URL fetch failed with status {response.status_code}")
+        response = await http_client.get(image_url)
+        if response.status_code == 200:
+            image_bytes = response.content
+            print(f"[VISION] Got image from URL: {len(image_bytes)} bytes")
+        else:
+            print(f"[VISION] URL fetch failed with status {response.status_code}")
 
     if not image_bytes:
         print(f"[VISION] No image bytes, generating placeholder for {camera_id}")